@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from enum import Enum
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -33,12 +34,36 @@ class Settings(BaseSettings):
     # S3 configuration (used when storage_backend is S3)
     s3_bucket_name: str = ""
     s3_region: str = "eu-west-3"
+    # Optional CDN in front of the bucket for reading OCR text and sentences
+    s3_cdn_base_url: str = ""
 
     # AWS CLI profile name
     aws_profile: str = ""
 
     # OCR configuration
     use_gpu: bool = True
+    ocr_cache_enabled: bool = True
+    # Cached OCR results kept on disk (least recently used are deleted first)
+    ocr_cache_max_entries: int = 10000
+    ocr_warmup: bool = True
+    ocr_precision: Literal["fp32", "fp16", "int8"] = "int8"
+    ocr_cudnn_benchmark: bool = False
+    ocr_pdf_dpi: int = 200
+    ocr_max_image_edge: int = 2560
+    ocr_workers: int = 1
+    # Processes rendering scanned PDF pages (1 renders in the OCR thread)
+    ocr_render_workers: int = 2
+    max_concurrent_ocr: int = 1
+    max_ocr_queue_depth: int = 8
+    ocr_max_batch_size: int = 8
+    ocr_batch_wait_ms: int = 50
+    # Seconds a failed background OCR job is reported before it's forgotten
+    ocr_failed_job_ttl: int = 600
+
+    # Text processing configuration
+    text_warmup: bool = True
+    # Recently split texts whose sentences are kept in memory (0 disables)
+    text_sentence_cache_size: int = 64
 
 
 # Global settings instance
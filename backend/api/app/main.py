@@ -1,19 +1,80 @@
 """FastAPI application exposing upload, OCR, and text-processing endpoints."""
 
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from .config import settings
-from .services import OCRProcessor, TextProcessor, create_storage
+from .services import OCRBatcher, OCRProcessor, TextProcessor, create_storage
 
-app = FastAPI(title="OCRean API", version="0.1.0")
+logger = logging.getLogger(__name__)
 
 # Initialize services using factory pattern
 file_storage = create_storage()
-ocr_processor = OCRProcessor(use_gpu=settings.use_gpu)
-text_processor = TextProcessor()
+ocr_processor = OCRProcessor(
+    use_gpu=settings.use_gpu,
+    cache_dir=Path(settings.local_data_dir).resolve() / "ocr",
+    use_cache=settings.ocr_cache_enabled,
+    cache_max_entries=settings.ocr_cache_max_entries,
+    precision=settings.ocr_precision,
+    pdf_dpi=settings.ocr_pdf_dpi,
+    max_image_edge=settings.ocr_max_image_edge,
+    render_workers=settings.ocr_render_workers,
+    cudnn_benchmark=settings.ocr_cudnn_benchmark,
+)
+text_processor = TextProcessor(sentence_cache_size=settings.text_sentence_cache_size)
+
+# OCR is blocking CPU/GPU work; keep it off the event loop. Each worker holds
+# model memory, so the pool is deliberately small.
+ocr_executor = ThreadPoolExecutor(max_workers=settings.ocr_workers, thread_name_prefix="ocr")
+
+# Requests arriving within a short window are OCR'd as one batch. At most
+# max_concurrent_ocr batches run at once and at most max_ocr_queue_depth
+# requests may wait; anything beyond that is rejected with 503.
+ocr_batcher = OCRBatcher(
+    ocr_processor,
+    ocr_executor,
+    max_batch_size=settings.ocr_max_batch_size,
+    max_wait=settings.ocr_batch_wait_ms / 1000,
+    max_queue_size=settings.max_ocr_queue_depth,
+    max_concurrent_batches=settings.max_concurrent_ocr,
+)
+
+# Background OCR jobs started through /ocr/jobs, by document ID. Entries are
+# removed once the text is saved, and failed ones after ocr_failed_job_ttl
+# seconds, so only in-flight and recently failed jobs remain.
+ocr_jobs: dict[str, dict[str, str]] = {}
+ocr_job_tasks: set[asyncio.Task[None]] = set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Load OCR and text models and start background batching for the lifetime of the app."""
+    if settings.ocr_warmup:
+        # Run on the OCR executor so models are initialized on the thread using them
+        await asyncio.get_running_loop().run_in_executor(ocr_executor, ocr_processor.warmup)
+    if settings.text_warmup:
+        await run_in_threadpool(text_processor.warmup)
+    ocr_batcher.start()
+    try:
+        yield
+    finally:
+        for task in ocr_job_tasks:
+            task.cancel()
+        await asyncio.gather(*ocr_job_tasks, return_exceptions=True)
+        await ocr_batcher.stop()
+        ocr_executor.shutdown(wait=False)
+
+
+app = FastAPI(title="OCRean API", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/")
@@ -23,9 +84,9 @@ async def root() -> dict[str, str]:
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
+async def health() -> dict[str, object]:
     """Liveness probe endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "ocr_pending": ocr_batcher.pending}
 
 
 @app.post("/documents/upload")
@@ -38,25 +99,92 @@ async def upload_document(file: Annotated[UploadFile, File()]) -> dict[str, str]
 @app.post("/documents/{document_id}/ocr")
 async def run_ocr(document_id: str) -> dict[str, str]:
     """Run OCR against a previously uploaded document."""
-    if not file_storage.get_raw_file_path(document_id):
+    text = await _ocr_document(document_id)
+    return {"document_id": document_id, "text": text}
+
+
+@app.post("/documents/{document_id}/ocr/jobs", status_code=202)
+async def start_ocr_job(document_id: str) -> dict[str, str]:
+    """Start OCR in the background and return at once; poll /ocr/status for the result."""
+    if not await run_in_threadpool(file_storage.get_raw_file_path, document_id):
+        raise HTTPException(status_code=404, detail="Document not found. Upload first.")
+
+    document_id = document_id.lower()
+    job = ocr_jobs.get(document_id)
+    if job is None or job["status"] == "failed":
+        job = ocr_jobs[document_id] = {"status": "processing"}
+        task = asyncio.create_task(_run_ocr_job(document_id))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        ocr_job_tasks.add(task)
+        task.add_done_callback(ocr_job_tasks.discard)
+    return {"document_id": document_id, **job}
+
+
+@app.get("/documents/{document_id}/ocr/status")
+async def get_ocr_status(document_id: str) -> dict[str, str]:
+    """Report whether OCR for a document is processing, done, failed or not started."""
+    job = ocr_jobs.get(document_id.lower())
+    if job is not None:
+        return {"document_id": document_id, **job}
+
+    # Only check that the text exists; pollers shouldn't download it each time
+    if await run_in_threadpool(file_storage.has_ocr_text, document_id):
+        return {"document_id": document_id, "status": "done"}
+    if not await run_in_threadpool(file_storage.get_raw_file_path, document_id):
         raise HTTPException(status_code=404, detail="Document not found. Upload first.")
+    return {"document_id": document_id, "status": "not_started"}
 
-    # Get file content and extension - storage backend handles the details
-    file_content = file_storage.get_raw_file_content(document_id)
-    document_path_or_key = file_storage.get_raw_file_path(document_id)
+
+async def _ocr_document(document_id: str) -> str:
+    """OCR a stored document and persist the text."""
+    # Storage calls may block on disk or S3, so keep them off the event loop
+    document_path_or_key = await run_in_threadpool(file_storage.get_raw_file_path, document_id)
+    if not document_path_or_key:
+        raise HTTPException(status_code=404, detail="Document not found. Upload first.")
+
+    # Get file content - storage backend handles the details
+    file_content = await run_in_threadpool(file_storage.get_raw_file_content, document_id)
 
     # Determine file extension from path/key
     file_extension = Path(str(document_path_or_key)).suffix
 
     # Process with OCR
-    text = ocr_processor.extract_text_from_bytes(file_content, file_extension)
+    text = await ocr_batcher.submit(file_content, file_extension)
 
-    file_storage.save_ocr_text(document_id, text)
-    return {"document_id": document_id, "text": text}
+    await run_in_threadpool(file_storage.save_ocr_text, document_id, text)
+    return text
 
 
+async def _run_ocr_job(document_id: str) -> None:
+    try:
+        await _ocr_document(document_id)
+    except HTTPException as exc:
+        _fail_ocr_job(document_id, str(exc.detail))
+    except Exception:
+        logger.exception("Background OCR failed for %s", document_id)
+        _fail_ocr_job(document_id, "OCR failed.")
+    else:
+        # Finished jobs are reported from the stored OCR text
+        ocr_jobs.pop(document_id, None)
+
+
+def _fail_ocr_job(document_id: str, detail: str) -> None:
+    job = ocr_jobs[document_id] = {"status": "failed", "detail": detail}
+    asyncio.get_running_loop().call_later(
+        settings.ocr_failed_job_ttl, _expire_ocr_job, document_id, job
+    )
+
+
+def _expire_ocr_job(document_id: str, job: dict[str, str]) -> None:
+    # A retry may have replaced the failed entry in the meantime
+    if ocr_jobs.get(document_id) is job:
+        del ocr_jobs[document_id]
+
+
+# Sentence splitting and vocabulary extraction are blocking (storage I/O and
+# CPU-bound text processing); plain def endpoints run in FastAPI's threadpool.
 @app.post("/documents/{document_id}/sentences")
-async def generate_sentences(document_id: str) -> dict[str, object]:
+def generate_sentences(document_id: str) -> dict[str, object]:
     """Split OCR text into sentences and persist the result."""
     text = file_storage.load_ocr_text(document_id)
     sentences = text_processor.split_into_sentences(text)
@@ -70,13 +198,19 @@ async def generate_sentences(document_id: str) -> dict[str, object]:
 
 
 @app.post("/documents/{document_id}/vocabulary")
-async def extract_vocabulary(document_id: str, min_length: int = 1) -> dict[str, object]:
+def extract_vocabulary(document_id: str, min_length: int = 1) -> dict[str, object]:
     """Extract Korean vocabulary from OCR text."""
     text = file_storage.load_ocr_text(document_id)
-    vocabulary = text_processor.extract_vocabulary(text, min_length=min_length)
+    vocabulary = list(_extract_vocabulary_cached(text, min_length))
     return {
         "document_id": document_id,
         "vocabulary": vocabulary,
         "vocabulary_count": len(vocabulary),
         "min_length": min_length,
     }
+
+
+@lru_cache(maxsize=64)
+def _extract_vocabulary_cached(text: str, min_length: int) -> tuple[str, ...]:
+    """Memoize vocabulary per OCR text, so re-running OCR never serves stale words."""
+    return tuple(text_processor.extract_vocabulary(text, min_length=min_length))
@@ -1,6 +1,6 @@
 """Service exports for the OCRean backend."""
 
-from .processing import OCRProcessor, TextProcessor
+from .processing import OCRBatcher, OCRProcessor, TextProcessor
 from .storage import FileStorage, LocalFileStorage, S3FileStorage, create_storage
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "LocalFileStorage",
     "S3FileStorage",
     "create_storage",
+    "OCRBatcher",
     "OCRProcessor",
     "TextProcessor",
 ]
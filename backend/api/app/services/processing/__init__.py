@@ -1,9 +1,11 @@
 """Document processing services."""
 
+from .batcher import OCRBatcher
 from .ocr import OCRProcessor
 from .text import TextProcessor
 
 __all__ = [
+    "OCRBatcher",
     "OCRProcessor",
     "TextProcessor",
 ]
@@ -0,0 +1,165 @@
+"""Dynamic batching of concurrent OCR requests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+from .ocr import OCRProcessor
+
+
+@dataclass(slots=True)
+class _OCRJob:
+    """A queued document waiting for its OCR result."""
+
+    file_content: bytes
+    file_extension: str
+    future: asyncio.Future[str]
+
+
+class OCRBatcher:
+    """Collects OCR requests arriving close together and runs them as one batch.
+
+    Requests are queued and a background task gathers up to ``max_batch_size``
+    of them, waiting at most ``max_wait`` seconds after the first one, before
+    handing the whole group to ``OCRProcessor.extract_text_batch`` on the
+    executor. The queue is bounded; once full, new requests are rejected.
+    """
+
+    def __init__(
+        self,
+        processor: OCRProcessor,
+        executor: Executor,
+        max_batch_size: int = 8,
+        max_wait: float = 0.05,
+        max_queue_size: int = 32,
+        max_concurrent_batches: int = 1,
+    ) -> None:
+        self.processor = processor
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue[_OCRJob] = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._slots = asyncio.Semaphore(max(1, max_concurrent_batches))
+        self._in_flight = 0
+        self._worker: asyncio.Task[None] | None = None
+        self._dispatches: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of requests queued or currently being processed."""
+        return self._queue.qsize() + self._in_flight
+
+    def start(self) -> None:
+        """Start the background dispatch loop on the running event loop."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop dispatching and fail any requests still waiting in the queue."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+        self._reject(queued)
+
+        # Let batches already handed to the executor finish
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, file_content: bytes, file_extension: str) -> str:
+        """Queue a document for OCR and wait for its text."""
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_OCRJob(file_content, file_extension, future))
+        except asyncio.QueueFull as exc:
+            raise HTTPException(status_code=503, detail="OCR queue is full. Retry later.") from exc
+        return await future
+
+    # Internal helpers -------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free slot first so requests keep accumulating into the
+            # next batch while the current ones are still running.
+            await self._slots.acquire()
+            batch: list[_OCRJob] = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._reject(batch)
+                raise
+
+            self._in_flight += len(batch)
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list[_OCRJob]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            documents = [(job.file_content, job.file_extension) for job in batch]
+            try:
+                texts = await loop.run_in_executor(
+                    self.executor, self.processor.extract_text_batch, documents
+                )
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Re-run one by one so a bad document only fails its own request
+                for job in batch:
+                    await self._dispatch_single(job)
+                return
+
+            for job, text in zip(batch, texts, strict=True):
+                if not job.future.done():
+                    job.future.set_result(text)
+        except Exception as exc:
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+        finally:
+            self._in_flight -= len(batch)
+            self._slots.release()
+
+    @staticmethod
+    def _reject(jobs: list[_OCRJob]) -> None:
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(
+                    HTTPException(status_code=503, detail="OCR service is shutting down.")
+                )
+
+    async def _dispatch_single(self, job: _OCRJob) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(
+                self.executor,
+                self.processor.extract_text_from_bytes,
+                job.file_content,
+                job.file_extension,
+            )
+        except Exception as exc:
+            if not job.future.done():
+                job.future.set_exception(exc)
+        else:
+            if not job.future.done():
+                job.future.set_result(text)
@@ -2,18 +2,76 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import io
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
 import tempfile
-from collections.abc import Iterable, Sequence
+import threading
+from collections import deque
+from collections.abc import Container, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import easyocr
 import numpy as np
+import torch
 from fastapi import HTTPException
 from PIL import Image
 
+from ..retry import retry
+
+if TYPE_CHECKING:
+    import pymupdf
+
 DEFAULT_LANGUAGES: Sequence[str] = ("ko", "en")
+# fp32: full precision everywhere; int8: EasyOCR's dynamic quantization (CPU
+# only, its default); fp16: half-precision models on CUDA.
+OCR_PRECISIONS: Sequence[str] = ("fp32", "fp16", "int8")
 PDF_SUFFIX = ".pdf"
+# EasyOCR's detector works on at most a 2560px canvas; larger images only add
+# recognizer work on over-resolved crops.
+DEFAULT_MAX_IMAGE_EDGE = 2560
+CACHE_PREFIX = "cache_"
+# blake2b personalization, so document and page keys never collide
+DOCUMENT_CACHE_PERSON = b"ocrean-document"
+PAGE_CACHE_PERSON = b"ocrean-page"
+# Cache files kept on disk; the least recently used are deleted beyond this,
+# checked once every CACHE_PRUNE_INTERVAL writes
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+CACHE_PRUNE_INTERVAL = 64
+# Characters of embedded text below which a PDF page is treated as a scan
+MIN_TEXT_LAYER_CHARS_PER_PAGE = 50
+# PyMuPDF isn't thread-safe, so PDFs with more pages than this are rendered
+# in worker processes, each handling a run of consecutive pages.
+PDF_RENDER_CHUNK_PAGES = 4
+# Render processes; each one holds a PyMuPDF document and its page buffers
+DEFAULT_RENDER_WORKERS = 2
+# Rendered pages held ahead of OCR, per OCR batch size, across all workers.
+# A 200 DPI A4 page is about 11 MB, so this bounds render memory regardless of
+# document length or worker count.
+RENDER_AHEAD_BATCHES = 2
+# tmpfs directory for files handed to render workers (falls back to the
+# default temp dir where it doesn't exist)
+SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+# Seconds OCR waits on page rendering before running the batches it already
+# has, even if they are not full.
+PAGE_BATCH_WAIT = 0.2
+
+logger = logging.getLogger(__name__)
+
+# Readers are shared by every OCRProcessor in the process so model weights
+# are loaded into memory once per configuration.
+_readers: dict[tuple[tuple[str, ...], bool, str, bool], easyocr.Reader] = {}
+_readers_lock = threading.Lock()
+
+_render_pool: ProcessPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
 
 
 class OCRProcessor:
@@ -24,10 +82,29 @@ class OCRProcessor:
         languages: Iterable[str] | None = None,
         use_gpu: bool | None = None,
         pdf_dpi: int = 200,
+        max_image_edge: int = DEFAULT_MAX_IMAGE_EDGE,
+        batch_size: int = 4,
+        cache_dir: Path | None = None,
+        use_cache: bool = True,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        precision: str = "int8",
+        render_workers: int = DEFAULT_RENDER_WORKERS,
+        cudnn_benchmark: bool = False,
     ) -> None:
+        if precision not in OCR_PRECISIONS:
+            raise ValueError(f"precision must be one of {', '.join(OCR_PRECISIONS)}")
         self.languages = tuple(languages or DEFAULT_LANGUAGES)
         self.use_gpu = self._resolve_gpu_flag(use_gpu)
+        self.precision = precision
+        self.cudnn_benchmark = cudnn_benchmark
         self.pdf_dpi = pdf_dpi
+        self.max_image_edge = max_image_edge
+        self.batch_size = max(1, batch_size)
+        self.render_workers = max(1, render_workers)
+        self.cache_dir = cache_dir if use_cache else None
+        self.cache_max_entries = max(1, cache_max_entries)
+        # next() on a count is atomic, so OCR threads can share it
+        self._cache_writes = itertools.count(1)
         self._reader: easyocr.Reader | None = None
 
     def extract_text(self, document_path: Path | str) -> str:
@@ -35,7 +112,7 @@ class OCRProcessor:
         if isinstance(document_path, Path):
             if not document_path.exists():
                 raise HTTPException(status_code=404, detail="Document not found on disk.")
-            return self._extract_from_path(document_path)
+            return self.extract_text_from_bytes(document_path.read_bytes(), document_path.suffix)
         else:
             # Assume it's an S3 key - will be handled differently
             raise HTTPException(
@@ -45,75 +122,382 @@ class OCRProcessor:
 
     def extract_text_from_bytes(self, file_content: bytes, file_extension: str) -> str:
         """Extract text from file bytes (useful for S3 storage)."""
-        if file_extension.lower() == PDF_SUFFIX:
-            # For PDFs, we need to save to a temp file
-            with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as tmp:
-                tmp.write(file_content)
-                tmp_path = Path(tmp.name)
+        return self.extract_text_batch([(file_content, file_extension)])[0]
 
-            try:
-                pages = self._convert_pdf_to_images(tmp_path)
-                if not pages:
-                    raise HTTPException(status_code=400, detail="No pages detected in PDF.")
-                chunks = [self._run_ocr(page) for page in pages]
-            finally:
-                tmp_path.unlink(missing_ok=True)
-        else:
-            # For images, we can process directly from bytes
-            try:
-                image = Image.open(io.BytesIO(file_content))
-                chunks = [self._run_ocr(image)]
-            except Exception as exc:
-                raise HTTPException(
-                    status_code=400, detail=f"Failed to process image: {exc}"
-                ) from exc
-
-        text = "\n\n".join(chunk for chunk in chunks if chunk)
-        return text.strip()
-
-    def _extract_from_path(self, document_path: Path) -> str:
-        """Extract text from a local file path."""
-        if document_path.suffix.lower() == PDF_SUFFIX:
-            pages = self._convert_pdf_to_images(document_path)
-            if not pages:
-                raise HTTPException(status_code=400, detail="No pages detected in PDF.")
-            chunks = [self._run_ocr(page) for page in pages]
-        else:
-            chunks = [self._run_ocr(document_path)]
+    def extract_text_batch(self, documents: Sequence[tuple[bytes, str]]) -> list[str]:
+        """Extract text from several documents, sharing OCR batches between them.
+
+        Each document is a ``(file_content, file_extension)`` pair; the results
+        are returned in the same order.
+        """
+        cache_keys = [
+            self._cache_key(DOCUMENT_CACHE_PERSON, file_content) for file_content, _ in documents
+        ]
+        texts = [self._read_cache(cache_key) for cache_key in cache_keys]
+        # One entry per page; pages sent to OCR hold None until their text is in
+        chunks: list[list[str | None]] = [[] for _ in documents]
+        page_owners: list[tuple[int, int]] = []
+        # Indices of pages that are whole images; the document entry already
+        # caches their text, so they get no page entry of their own
+        image_pages: set[int] = set()
 
-        text = "\n\n".join(chunk for chunk in chunks if chunk)
-        return text.strip()
+        def pending_pages() -> Iterator[np.ndarray]:
+            # Pages are produced lazily so only the current OCR batches are
+            # held in memory rather than every rendered page at once.
+            for index, (file_content, file_extension) in enumerate(documents):
+                if texts[index] is not None:
+                    continue
+                if file_extension.lower() == PDF_SUFFIX:
+                    document_pages = self._iter_pdf(file_content, chunks[index])
+                else:
+                    chunks[index].append(None)
+                    image_pages.add(len(page_owners))
+                    document_pages = iter([self._load_image(file_content)])
+                for page in document_pages:
+                    # The page's placeholder is the last entry added
+                    page_owners.append((index, len(chunks[index]) - 1))
+                    yield self._downscale(page)
+
+        # Rendering and decoding run on a producer thread so they overlap OCR.
+        # Closing the stream stops and joins that thread before an OCR error
+        # propagates, instead of whenever the suspended generator is collected.
+        with contextlib.closing(
+            _prefetch(pending_pages(), depth=self.batch_size, idle_timeout=PAGE_BATCH_WAIT)
+        ) as stream:
+            page_texts = self._run_ocr_pages(stream, uncached_pages=image_pages)
+        for (owner, slot), text in zip(page_owners, page_texts, strict=True):
+            # Strip per page so the joined document needs no second pass
+            chunks[owner][slot] = text.strip()
+
+        results: list[str] = []
+        for index, cache_key in enumerate(cache_keys):
+            text = texts[index]
+            if text is None:
+                text = "\n\n".join(chunk for chunk in chunks[index] if chunk)
+                self._write_cache(cache_key, text)
+            results.append(text)
+        return results
+
+    def warmup(self) -> None:
+        """Load the EasyOCR models and run a tiny image through them.
+
+        Call this at startup so the first request doesn't pay for model loading
+        and CUDA initialization.
+        """
+        reader = self._get_reader()
+        with torch.inference_mode():
+            reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
 
     # Internal helpers -----------------------------------------------------
 
+    def _iter_pdf(self, file_content: bytes, text_chunks: list[str | None]) -> Iterator[np.ndarray]:
+        """Fill ``text_chunks`` page by page and yield the pages that need OCR.
+
+        Pages with enough embedded text use it directly; the others are
+        rendered, get a ``None`` placeholder, and are yielded in page order.
+        """
+        text_layer = self._extract_text_layer(file_content)
+        if text_layer is None:
+            logger.info("No readable PDF text layer, running OCR on every page")
+            page_count = 0
+            for page in self._convert_pdf_to_images(file_content):
+                page_count += 1
+                text_chunks.append(None)
+                yield page
+            if not page_count:
+                raise HTTPException(status_code=400, detail="No pages detected in PDF.")
+            return
+
+        if not text_layer:
+            raise HTTPException(status_code=400, detail="No pages detected in PDF.")
+        scanned = [
+            number
+            for number, text in enumerate(text_layer)
+            if len(text) < MIN_TEXT_LAYER_CHARS_PER_PAGE
+        ]
+        logger.info(
+            "Using embedded PDF text for %d of %d pages",
+            len(text_layer) - len(scanned),
+            len(text_layer),
+        )
+        # Only advanced for scanned pages, so nothing is opened when there are none
+        rendered = self._convert_pdf_to_images(file_content, scanned)
+        try:
+            for text in text_layer:
+                if len(text) >= MIN_TEXT_LAYER_CHARS_PER_PAGE:
+                    text_chunks.append(text)
+                else:
+                    text_chunks.append(None)
+                    yield next(rendered)
+        finally:
+            rendered.close()
+
+    def _downscale(self, page: np.ndarray) -> np.ndarray:
+        """Shrink ``page`` so its longest edge is at most ``max_image_edge``."""
+        height, width = page.shape[:2]
+        scale = self.max_image_edge / max(height, width)
+        if scale >= 1:
+            return page
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # Box filtering averages each source area, like INTER_AREA, so text
+        # strokes don't alias when shrinking
+        return np.asarray(Image.fromarray(page).resize(size, Image.Resampling.BOX))
+
+    @staticmethod
+    def _load_image(file_content: bytes) -> np.ndarray:
+        try:
+            with Image.open(io.BytesIO(file_content)) as image:
+                rgb = image if image.mode == "RGB" else image.convert("RGB")
+                return np.asarray(rgb)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=f"Failed to process image: {exc}") from exc
+
+    def _extract_text_layer(self, file_content: bytes) -> list[str] | None:
+        """Return each page's stripped embedded text, or None if it can't be read."""
+        try:
+            try:
+                import pymupdf
+
+                with pymupdf.open(stream=file_content, filetype="pdf") as document:
+                    pages = [page.get_text() for page in document]
+            except ImportError:  # pragma: no cover - fall back to pypdf
+                from pypdf import PdfReader
+
+                reader = PdfReader(io.BytesIO(file_content))
+                pages = [page.extract_text() or "" for page in reader.pages]
+        except Exception:  # pragma: no cover - let the OCR path report errors
+            return None
+
+        return [page.strip() for page in pages]
+
     def _get_reader(self) -> easyocr.Reader:
         if self._reader is None:
-            self._reader = easyocr.Reader(self.languages, gpu=self.use_gpu)
+            self._reader = _load_reader(
+                self.languages, self.use_gpu, self.precision, self.cudnn_benchmark
+            )
         return self._reader
 
-    def _run_ocr(self, source: Path | Image.Image) -> str:
+    def _run_ocr_pages(
+        self, pages: Iterable[np.ndarray | None], uncached_pages: Container[int] = ()
+    ) -> list[str]:
+        """OCR page images in batches, reusing results for identical pages.
+
+        A ``None`` item means no page is ready yet; partially filled batches
+        are run then instead of leaving OCR idle while pages render. Pages
+        whose index is in ``uncached_pages`` bypass the page cache.
+        """
+        texts: list[str | None] = []
+        cache_keys: list[str | None] = []
+        # readtext_batched stacks its inputs into a single array, so only
+        # pages of identical shape can share a call. A group is flushed as
+        # soon as it fills up, which bounds how many pages are held at once.
+        groups: dict[tuple[int, ...], list[tuple[int, np.ndarray]]] = {}
+
+        for page in pages:
+            if page is None:
+                for group in groups.values():
+                    if group:
+                        self._flush_ocr_group(group, texts, cache_keys)
+                continue
+            # EasyOCR and hashing both need C-contiguous buffers; this is a
+            # no-op for pages coming from the renderer or image decoder.
+            page = np.ascontiguousarray(page)
+            cache_key = (
+                None
+                if len(texts) in uncached_pages
+                else self._cache_key(
+                    PAGE_CACHE_PERSON, f"{page.shape}:{page.dtype}".encode(), page.data
+                )
+            )
+            text = self._read_cache(cache_key)
+            texts.append(text)
+            cache_keys.append(cache_key)
+            if text is not None:
+                continue
+
+            group = groups.setdefault(page.shape, [])
+            group.append((len(texts) - 1, page))
+            if len(group) == self.batch_size:
+                self._flush_ocr_group(group, texts, cache_keys)
+
+        for group in groups.values():
+            if group:
+                self._flush_ocr_group(group, texts, cache_keys)
+        return [text or "" for text in texts]
+
+    def _flush_ocr_group(
+        self,
+        group: list[tuple[int, np.ndarray]],
+        texts: list[str | None],
+        cache_keys: list[str | None],
+    ) -> None:
+        results = self._run_ocr_batch([page for _, page in group])
+        for (index, _), text in zip(group, results, strict=True):
+            texts[index] = text
+            self._write_cache(cache_keys[index], text)
+        group.clear()
+
+    # Another job's allocation spike can briefly exhaust GPU memory; free the
+    # allocator cache and try the batch again before failing the request.
+    @retry(torch.cuda.OutOfMemoryError, on_retry=lambda _exc: torch.cuda.empty_cache())
+    def _run_ocr_batch(self, images: Sequence[np.ndarray]) -> list[str]:
         reader = self._get_reader()
-        if isinstance(source, Path):
-            results = reader.readtext(str(source))
-        else:
-            results = reader.readtext(np.array(source))
-        return " ".join(item[1] for item in results)
+        # EasyOCR only disables autograd; inference mode also skips version
+        # counting and view tracking on every tensor it creates.
+        with torch.inference_mode():
+            results = reader.readtext_batched(list(images), batch_size=self.batch_size)
+        return [" ".join(item[1] for item in page) for page in results]
+
+    def _cache_key(self, person: bytes, *chunks: bytes) -> str | None:
+        """Fingerprint ``chunks``, or return None when caching is off."""
+        if self.cache_dir is None:
+            return None
+        # Results depend on the recognizer languages and precision, render DPI
+        # and image size limit, so they are folded in with the content.
+        digest = hashlib.blake2b(digest_size=16, person=person)
+        languages = ",".join(self.languages)
+        digest.update(
+            f"{languages}:{self.precision}:{self.pdf_dpi}:{self.max_image_edge}:".encode()
+        )
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_cache(self, cache_key: str | None) -> str | None:
+        if cache_key is None:
+            return None
+        path = self._cache_path(cache_key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        # Hits refresh the mtime, which pruning treats as the last use
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return text
 
-    def _convert_pdf_to_images(self, pdf_path: Path) -> list[Image.Image]:
+    def _write_cache(self, cache_key: str | None, text: str) -> None:
+        if cache_key is None:
+            return
+        assert self.cache_dir is not None
+        path = self._cache_path(cache_key)
+        # Unique per thread: OCR threads may write the same key at once
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
         try:
-            from pdf2image import convert_from_path
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            # Atomic rename so concurrent readers never see a partial entry
+            os.replace(tmp_path, path)
+        except OSError:  # pragma: no cover - cache is best effort
+            tmp_path.unlink(missing_ok=True)
+            return
+        if next(self._cache_writes) % CACHE_PRUNE_INTERVAL == 0:
+            self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Delete the least recently used entries beyond ``cache_max_entries``."""
+        assert self.cache_dir is not None
+        entries: list[tuple[float, str]] = []
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.startswith(CACHE_PREFIX) and entry.name.endswith(".txt"):
+                        with contextlib.suppress(OSError):
+                            entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:  # pragma: no cover - cache is best effort
+            return
+        excess = len(entries) - self.cache_max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+
+    def _cache_path(self, cache_key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{CACHE_PREFIX}{cache_key}.txt"
+
+    def _convert_pdf_to_images(
+        self, file_content: bytes, page_numbers: Sequence[int] | None = None
+    ) -> Iterator[np.ndarray]:
+        """Render ``page_numbers`` (every page when None) in order."""
+        try:
+            import pymupdf
+        except ImportError:  # pragma: no cover - fall back to poppler
+            yield from self._convert_pdf_with_pdf2image(file_content, page_numbers)
+            return
+
+        try:
+            # Short documents are rendered straight from memory
+            with pymupdf.open(stream=file_content, filetype="pdf") as document:
+                if page_numbers is None:
+                    page_numbers = range(document.page_count)
+                page_count = len(page_numbers)
+                if self.render_workers <= 1 or page_count <= PDF_RENDER_CHUNK_PAGES:
+                    for number in page_numbers:
+                        page = document[number]
+                        yield _pixmap_to_array(page.get_pixmap(dpi=self.pdf_dpi, alpha=False))
+                    return
+
+            # Rendering overlaps OCR, but the ranges in flight (including the
+            # one being consumed) never hold more than the page budget.
+            pool = _get_render_pool(self.render_workers)
+            page_budget = RENDER_AHEAD_BATCHES * self.batch_size
+            chunk_pages = _render_chunk_pages(page_budget, self.render_workers)
+            max_pending = max(1, page_budget // chunk_pages)
+            pending: deque[Future[list[np.ndarray]]] = deque()
+
+            # Render workers open the PDF by path; a RAM-backed temp file keeps
+            # that from costing disk I/O. Nothing that can fail runs between
+            # creating it and the try that removes it.
+            tmp = tempfile.NamedTemporaryFile(
+                suffix=PDF_SUFFIX, delete=False, dir=SHARED_MEMORY_DIR
+            )
+            pdf_path = tmp.name
+            try:
+                with tmp:
+                    tmp.write(file_content)
+                for start in range(0, page_count, chunk_pages):
+                    numbers = list(page_numbers[start : start + chunk_pages])
+                    pending.append(
+                        pool.submit(_render_page_numbers, pdf_path, self.pdf_dpi, numbers)
+                    )
+                    if len(pending) >= max_pending:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+                # Ranges still running when we bail out are discarded anyway
+                os.unlink(pdf_path)
+        except Exception as exc:  # pragma: no cover - conversion issues
+            raise HTTPException(
+                status_code=500, detail=f"Failed to convert PDF to images: {exc}"
+            ) from exc
+
+    def _convert_pdf_with_pdf2image(
+        self, file_content: bytes, page_numbers: Sequence[int] | None = None
+    ) -> Iterator[np.ndarray]:
+        try:
+            from pdf2image import convert_from_bytes
         except ImportError as exc:  # pragma: no cover - dependency guard
             raise HTTPException(
                 status_code=500,
-                detail="pdf2image is required for PDF OCR. Install poppler and pdf2image.",
+                detail="PyMuPDF or pdf2image is required for PDF OCR.",
             ) from exc
 
         try:
-            return convert_from_path(str(pdf_path), dpi=self.pdf_dpi)
+            pages = convert_from_bytes(file_content, dpi=self.pdf_dpi)
         except Exception as exc:  # pragma: no cover - conversion issues
             raise HTTPException(
                 status_code=500, detail=f"Failed to convert PDF to images: {exc}"
             ) from exc
+        if page_numbers is not None:
+            pages = [pages[number] for number in page_numbers]
+        for page in pages:
+            yield np.asarray(page)
 
     @staticmethod
     def _resolve_gpu_flag(requested: bool | None) -> bool:
@@ -121,8 +505,139 @@ class OCRProcessor:
             return requested
 
         try:
-            import torch  # type: ignore
-
             return torch.cuda.is_available()
-        except Exception:  # pragma: no cover - torch optional
+        except Exception:  # pragma: no cover - broken CUDA setup
             return False
+
+
+def _load_reader(
+    languages: tuple[str, ...], use_gpu: bool, precision: str, cudnn_benchmark: bool
+) -> easyocr.Reader:
+    key = (languages, use_gpu, precision, cudnn_benchmark)
+    reader = _readers.get(key)
+    if reader is not None:
+        return reader
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = easyocr.Reader(
+                languages,
+                gpu=use_gpu,
+                quantize=precision == "int8",
+                cudnn_benchmark=cudnn_benchmark,
+            )
+            if precision == "fp16" and str(reader.device).startswith("cuda"):
+                _use_half_precision(reader.detector)
+                _use_half_precision(reader.recognizer)
+            _readers[key] = reader
+        return reader
+
+
+def _prefetch[T](items: Iterable[T], depth: int, idle_timeout: float) -> Iterator[T | None]:
+    """Produce ``items`` on a background thread, staying at most ``depth`` ahead.
+
+    Yields ``None`` whenever nothing has arrived for ``idle_timeout`` seconds.
+    Errors raised by the producer are re-raised in the consumer.
+    """
+    buffer: queue.Queue[tuple[bool, object]] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry: tuple[bool, object]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((True, item)):
+                    return
+            put((True, done))
+        except Exception as exc:
+            put((False, exc))
+        finally:
+            # Close generators here so their cleanup runs on this thread
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="ocr-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            try:
+                ok, item = buffer.get(timeout=idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if not ok:
+                assert isinstance(item, Exception)
+                raise item
+            if item is done:
+                return
+            yield cast(T, item)
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _get_render_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Forked children would inherit the API's threads and CUDA state,
+            # and spawned ones re-import the OCR stack per worker; a forkserver
+            # with this module preloaded pays that import once.
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__])
+            _render_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        return _render_pool
+
+
+def _render_chunk_pages(page_budget: int, workers: int) -> int:
+    # Split the budget so every worker can have a range in flight
+    return max(1, page_budget // workers)
+
+
+def _render_page_numbers(pdf_path: str, dpi: int, numbers: list[int]) -> list[np.ndarray]:
+    """Render the given pages of a PDF; runs inside render workers."""
+    import pymupdf
+
+    with pymupdf.open(pdf_path) as document:
+        return [
+            _pixmap_to_array(document[number].get_pixmap(dpi=dpi, alpha=False))
+            for number in numbers
+        ]
+
+
+def _pixmap_to_array(pixmap: pymupdf.Pixmap) -> np.ndarray:
+    # Without an alpha channel the samples are tightly packed RGB rows
+    return np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(
+        pixmap.height, pixmap.width, pixmap.n
+    )
+
+
+def _use_half_precision(module: torch.nn.Module) -> None:
+    """Run ``module`` in float16 while keeping float32 at its boundaries.
+
+    EasyOCR feeds its models float32 tensors and post-processes their outputs
+    with OpenCV, which doesn't accept float16, so inputs are cast down and
+    outputs cast back up around the half-precision forward pass.
+    """
+
+    def cast(value: object, dtype: torch.dtype) -> object:
+        if isinstance(value, torch.Tensor) and value.is_floating_point():
+            return value.to(dtype)
+        if isinstance(value, tuple | list):
+            return type(value)(cast(item, dtype) for item in value)
+        return value
+
+    module.half()
+    module.register_forward_pre_hook(lambda _module, args: cast(args, torch.float16))
+    module.register_forward_hook(lambda _module, _args, output: cast(output, torch.float32))
@@ -2,59 +2,211 @@
 
 from __future__ import annotations
 
+import hashlib
+import multiprocessing
+import os
 import re
+import sys
+import threading
+from collections import OrderedDict
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from typing import Any
 
 from kss import split_sentences
 
-KOREAN_PATTERN = re.compile(r"[가-힣]+")
+try:  # Optional linear-time engine; only used where its semantics match ``re``
+    import re2
+except ImportError:
+    re2 = None
+
+try:  # Optional; substitutes faster than ``re`` for the orphan-digit pattern
+    import regex
+except ImportError:
+    regex = None
+
+# RE2 treats \s, \w, \d and \b as ASCII-only, so only the literal Hangul
+# class is safe to compile with it; the other patterns stay on ``re``.
+KOREAN_PATTERN = (re2 or re).compile(r"[가-힣]+")
+# Korean words, particles included, rarely run this long; longer Hangul runs
+# mean OCR dropped the spaces and the spacer has work to do.
+UNSPACED_HANGUL_PATTERN = (re2 or re).compile(r"[가-힣]{8,}")
 NOISE_PATTERN = re.compile(r"^[\W\d_]+$", re.UNICODE)
-WHITESPACE_PATTERN = re.compile(r"\s+")
-ESCAPED_QUOTE_PATTERN = re.compile(r'\\"')
-DIGIT_ORPHAN_PATTERN = re.compile(r"\b\d{1,4}\b")
+DIGIT_PATTERN = re.compile(r"\d")
+DIGIT_ORPHAN_PATTERN = (
+    regex.compile(r"\b\d{1,4}\b", regex.V1) if regex else re.compile(r"\b\d{1,4}\b")
+)
 QUOTE_PATTERN = re.compile(r'(["\'])(.+?)\1')
 SENTENCE_STRIP_CHARS = " :;-—\"'“”‘’·•()[]"
 MIN_SENTENCE_LENGTH = 3
+# Entries hold a whole document's sentences, so keep only a few dozen
+DEFAULT_SENTENCE_CACHE_SIZE = 64
+# Longer texts are split without caching, so a handful of very large documents
+# can't pin memory however few entries the cache holds
+MAX_CACHED_SENTENCE_TEXT = 100_000
+PROCESS_METHODS = ("clean_text", "split_into_sentences", "extract_vocabulary")
+
+# Pecab loads its dictionary on construction, so one instance is shared by all
+# processors and created on first use.
+_spacer: Any | None = None
+_spacer_loaded = False
+_spacer_lock = threading.Lock()
+
+# Set in process_many's forked workers
+_worker_processor: TextProcessor | None = None
 
 
 class TextProcessor:
     """Encapsulates text cleaning, sentence splitting, and vocabulary extraction."""
 
-    def __init__(self) -> None:
-        self._spacer = self._init_spacer()
+    __slots__ = (
+        "_clean_cache",
+        "_sentence_cache",
+        "_sentence_cache_lock",
+        "_sentence_cache_size",
+    )
+
+    def __init__(self, sentence_cache_size: int = DEFAULT_SENTENCE_CACHE_SIZE) -> None:
+        # KSS dominates split cost, so remember its output for recently seen
+        # texts (LRU keyed by a digest, so the texts themselves aren't kept)
+        self._sentence_cache: OrderedDict[bytes, tuple[str, ...]] = OrderedDict()
+        self._sentence_cache_lock = threading.Lock()
+        self._sentence_cache_size = sentence_cache_size
+        # Last (input, output) of clean_text: a page's sentences and vocabulary
+        # are usually extracted back to back from the same OCR text
+        self._clean_cache: tuple[str, str] = ("", "")
 
     def clean_text(self, text: str) -> str:
         """Normalize whitespace, fix simple OCR artifacts, and trim."""
-        normalized = (text or "").replace("\\n", " ")
-        normalized = ESCAPED_QUOTE_PATTERN.sub('"', normalized)
-        normalized = WHITESPACE_PATTERN.sub(" ", normalized)
-        normalized = self._maybe_apply_spacing(normalized)
-        normalized = WHITESPACE_PATTERN.sub(" ", normalized)
-        return normalized.strip()
+        cached_text, cached_result = self._clean_cache
+        if text == cached_text:
+            return cached_result
+        result = self._clean_text(text)
+        self._clean_cache = (text, result)
+        return result
 
     def split_into_sentences(self, text: str) -> list[str]:
         """Split cleaned Korean text into sentences."""
         normalized = self.clean_text(text)
         if not normalized:
             return []
-        raw_sentences = split_sentences(normalized)
+        raw_sentences = self._split_sentences(normalized)
         return self._post_process_sentences(raw_sentences)
 
-    def extract_vocabulary(self, text: str, min_length: int = 1) -> list[str]:
-        """Extract unique Korean words above a minimum length."""
+    def split_many(self, texts: Sequence[str], num_workers: int = 1) -> list[list[str]]:
+        """Split several texts into sentences with a single KSS call.
+
+        Texts are split in the calling thread unless ``num_workers`` is above
+        1, in which case KSS forks that many processes for the batch. Forking
+        only copies the calling thread, so leave it at 1 in the API process.
+        """
+        cleaned = [self.clean_text(text) for text in texts]
+        pending = [text for text in cleaned if text]
+        raw_lists = iter(split_sentences(pending, num_workers=num_workers) if pending else [])
+        return [self._post_process_sentences(next(raw_lists)) if text else [] for text in cleaned]
+
+    def process_many(
+        self,
+        texts: Sequence[str],
+        method: str = "split_into_sentences",
+        workers: int | None = None,
+    ) -> list[Any]:
+        """Apply ``method`` to every text in parallel, keeping the input order.
+
+        On Linux the texts are spread over ``workers`` forked processes (one per
+        CPU core when unset) that inherit the warmed-up KSS and Pecab state;
+        elsewhere a thread pool is used. Forking only copies the calling thread,
+        so this is meant for batch jobs rather than the API process.
+        """
+        if method not in PROCESS_METHODS:
+            raise ValueError(f"method must be one of {', '.join(PROCESS_METHODS)}")
+        if not texts:
+            return []
+        if not sys.platform.startswith("linux"):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(getattr(self, method), texts))
+
+        # Load KSS and Pecab once here so the forked workers share them copy-on-write
+        self.warmup()
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            chunksize = max(1, len(texts) // (4 * workers))
+            return list(
+                executor.map(_process_in_worker, repeat(method), texts, chunksize=chunksize)
+            )
+
+    def extract_vocabulary(self, text: str, min_length: int = 1, *, sort: bool = True) -> list[str]:
+        """Extract unique Korean words above a minimum length.
+
+        Words are sorted unless ``sort`` is false, in which case they come back
+        in no particular order.
+        """
         normalized = self.clean_text(text)
-        words = KOREAN_PATTERN.findall(normalized)
-        filtered = {word for word in words if len(word) >= max(1, min_length)}
-        return sorted(filtered)
+        # Deduplicate first so the length check only runs once per distinct word
+        words = set(KOREAN_PATTERN.findall(normalized))
+        if min_length > 1:
+            words = {word for word in words if len(word) >= min_length}
+        return sorted(words) if sort else list(words)
+
+    def warmup(self) -> None:
+        """Load the Pecab dictionary and KSS backend by splitting a short text.
+
+        Call this at startup so the first request doesn't pay for it. The
+        probe bypasses the caches so it doesn't occupy a slot.
+        """
+        spacer = _load_spacer()
+        if spacer:
+            spacer.spacing("준비되었습니다")
+        split_sentences("준비되었습니다. 시작합니다.")
+
+    def clear_cache(self) -> None:
+        """Forget memoized cleaned text and sentence splits."""
+        self._clean_cache = ("", "")
+        with self._sentence_cache_lock:
+            self._sentence_cache.clear()
 
     # Internal helpers -------------------------------------------------
 
+    def _clean_text(self, text: str) -> str:
+        # Literal escapes need no regex; whitespace is collapsed in a single pass
+        normalized = (text or "").replace("\\n", " ").replace('\\"', '"')
+        normalized = _collapse_whitespace(normalized)
+        spaced = self._maybe_apply_spacing(normalized)
+        if spaced != normalized:
+            # Only re-collapse when the spacer actually rewrote the text
+            normalized = _collapse_whitespace(spaced)
+        return normalized
+
+    def _split_sentences(self, text: str) -> tuple[str, ...]:
+        if self._sentence_cache_size <= 0 or len(text) > MAX_CACHED_SENTENCE_TEXT:
+            return _split_sentences(text)
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._sentence_cache_lock:
+            sentences = self._sentence_cache.get(key)
+            if sentences is not None:
+                self._sentence_cache.move_to_end(key)
+                return sentences
+        sentences = _split_sentences(text)
+        with self._sentence_cache_lock:
+            self._sentence_cache[key] = sentences
+            while len(self._sentence_cache) > self._sentence_cache_size:
+                self._sentence_cache.popitem(last=False)
+        return sentences
+
     def _post_process_sentences(self, sentences: Sequence[str]) -> list[str]:
         cleaned: list[str] = []
+        # Bound once: these run for every sentence of every page
+        split_quoted_segments = self._split_quoted_segments
+        normalize_sentence = self._normalize_sentence
         for sentence in sentences:
-            for segment in self._split_quoted_segments(sentence):
-                normalized = self._normalize_sentence(segment)
+            for segment in split_quoted_segments(sentence):
+                normalized = normalize_sentence(segment)
                 if normalized:
                     cleaned.append(normalized)
         return cleaned
@@ -63,8 +215,12 @@ class TextProcessor:
         if not sentence:
             return None
         text = sentence.strip(SENTENCE_STRIP_CHARS)
-        text = DIGIT_ORPHAN_PATTERN.sub("", text)
-        text = WHITESPACE_PATTERN.sub(" ", text).strip(SENTENCE_STRIP_CHARS)
+        # Sentences come from clean_text, so whitespace is already collapsed;
+        # only dropping numbers can leave double spaces or new edge characters.
+        # Most sentences have no digits, and finding none is cheaper than a failed sub.
+        if DIGIT_PATTERN.search(text):
+            text = DIGIT_ORPHAN_PATTERN.sub("", text)
+            text = _collapse_whitespace(text).strip(SENTENCE_STRIP_CHARS)
         if len(text) < MIN_SENTENCE_LENGTH:
             return None
         if NOISE_PATTERN.fullmatch(text):
@@ -72,6 +228,10 @@ class TextProcessor:
         return text
 
     def _split_quoted_segments(self, sentence: str) -> list[str]:
+        if '"' not in sentence and "'" not in sentence:
+            stripped = sentence.strip()
+            return [stripped] if stripped else []
+
         segments: list[str] = []
         last_index = 0
 
@@ -93,17 +253,48 @@ class TextProcessor:
         return segments
 
     def _maybe_apply_spacing(self, text: str) -> str:
-        if not self._spacer:
+        if not UNSPACED_HANGUL_PATTERN.search(text):
+            return text
+        spacer = _load_spacer()
+        if not spacer:
             return text
         try:
-            return self._spacer.spacing(text)
+            return spacer.spacing(text)
         except Exception:
             return text
 
-    def _init_spacer(self) -> Any | None:
-        try:
-            from pecab import Pecab
 
-            return Pecab()
-        except Exception:
-            return None
+def _load_spacer() -> Any | None:
+    global _spacer, _spacer_loaded
+    if _spacer_loaded:
+        return _spacer
+    with _spacer_lock:
+        if not _spacer_loaded:
+            try:
+                from pecab import Pecab
+
+                _spacer = Pecab()
+            except Exception:
+                _spacer = None
+            _spacer_loaded = True
+        return _spacer
+
+
+def _split_sentences(text: str) -> tuple[str, ...]:
+    # Tuples keep cached results safe from callers mutating them
+    return tuple(split_sentences(text))
+
+
+def _collapse_whitespace(text: str) -> str:
+    # str.split() treats exactly the characters matched by \s as whitespace,
+    # and splitting in C beats a regex substitution
+    return " ".join(text.split())
+
+
+def _init_worker(processor: TextProcessor) -> None:
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _process_in_worker(method: str, text: str) -> Any:
+    return getattr(_worker_processor, method)(text)
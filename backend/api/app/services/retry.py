@@ -0,0 +1,50 @@
+"""Retry helper for transient failures in blocking service calls."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from collections.abc import Callable
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+def retry(
+    exceptions: type[BaseException] | tuple[type[BaseException], ...],
+    *,
+    tries: int = 3,
+    base: float = 0.5,
+    cap: float = 8.0,
+    on_retry: Callable[[BaseException], None] | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Retry the decorated function on ``exceptions`` with exponential backoff.
+
+    The function is called at most ``tries`` times, sleeping
+    ``min(cap, base * 2**attempt)`` seconds between attempts. ``on_retry`` runs
+    before each sleep, e.g. to release resources the failure left behind.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            for attempt in range(tries - 1):
+                try:
+                    return func(*args, **kwargs)
+                except exceptions as exc:
+                    delay = min(cap, base * 2**attempt)
+                    logger.warning(
+                        "%s failed (%s), retrying in %.1fs", func.__qualname__, exc, delay
+                    )
+                    if on_retry is not None:
+                        on_retry(exc)
+                    time.sleep(delay)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -37,6 +37,7 @@ def create_storage() -> FileStorage:
             bucket_name=settings.s3_bucket_name,
             region=settings.s3_region,
             aws_profile=settings.aws_profile,
+            cdn_base_url=settings.s3_cdn_base_url,
         )
 
     data_dir = Path(settings.local_data_dir).resolve()
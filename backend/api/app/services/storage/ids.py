@@ -0,0 +1,29 @@
+"""Document ID generation and validation shared by the storage backends."""
+
+from __future__ import annotations
+
+import re
+import secrets
+import time
+import uuid
+
+# Canonical hyphenated UUID text, the only form new_document_id produces
+DOCUMENT_ID_PATTERN = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
+def new_document_id() -> str:
+    """Return a new time-ordered document ID (UUID version 7).
+
+    The leading 48 bits are the Unix time in milliseconds, so IDs sort by
+    upload time and new files cluster together in directory and S3 key
+    listings. The rest is random, as with the previous UUID4 IDs.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= secrets.randbits(12) << 64
+    value |= 0b10 << 62  # RFC 9562 variant
+    value |= secrets.randbits(62)
+    return str(uuid.UUID(int=value))
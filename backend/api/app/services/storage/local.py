@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-import json
-import uuid
+import functools
+import os
+import threading
 from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import aiofiles
+import orjson
 from fastapi import HTTPException, UploadFile
 
+from .ids import DOCUMENT_ID_PATTERN, new_document_id
+
 PDF_CONTENT_TYPE = "application/pdf"
 IMAGE_PREFIX = "image/"
 DEFAULT_IMAGE_EXTENSION = ".jpg"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 @dataclass(slots=True)
@@ -36,12 +42,24 @@ class StoragePaths:
             path.mkdir(parents=True, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=64)
+def _read_text_cached(path: Path, mtime_ns: int, size: int) -> str:
+    """Read a UTF-8 file, memoized per version (mtime/size) of the file."""
+    return path.read_text(encoding="utf-8")
+
+
 class LocalFileStorage:
     """Local file storage manager for uploaded documents and derived data."""
 
     def __init__(self, base_dir: Path):
         self.paths = StoragePaths(base_dir)
         self.paths.ensure_exists()
+        # document_id -> extension of its raw upload, so lookups don't scan raw/.
+        # The index is rebuilt only when raw/ has changed since the last scan.
+        self._extensions: dict[str, str] = {}
+        self._extensions_lock = threading.Lock()
+        self._raw_mtime_ns = -1
+        self._scan_raw()
 
     async def save_uploaded_file(self, file: UploadFile) -> str:
         """Persist an uploaded PDF/image and return its document ID."""
@@ -50,21 +68,39 @@ class LocalFileStorage:
             raise HTTPException(status_code=400, detail="Could not determine file type")
 
         extension = self._resolve_extension(file, content_type)
-        document_id = str(uuid.uuid4())
+        document_id = new_document_id()
         file_path = self.paths.raw / f"{document_id}{extension}"
 
         try:
-            file_path.write_bytes(await file.read())
+            # Stream in chunks so memory use doesn't grow with the upload size
+            async with aiofiles.open(file_path, "wb") as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await out.write(chunk)
         except Exception as exc:  # pragma: no cover - defensive
+            file_path.unlink(missing_ok=True)
             raise HTTPException(status_code=500, detail="Failed to save file") from exc
 
+        with self._extensions_lock:
+            self._extensions[document_id] = extension
         return document_id
 
     def get_raw_file_path(self, document_id: str) -> Path | None:
         """Return the stored raw file path if it exists."""
         document_id = self._validate_document_id(document_id)
-        matches = list(self.paths.raw.glob(f"{document_id}.*"))
-        return matches[0] if matches else None
+        extension = self._extensions.get(document_id)
+        if extension is not None:
+            file_path = self.paths.raw / f"{document_id}{extension}"
+            if file_path.is_file():
+                return file_path
+
+        # Not indexed: rescan only if raw/ changed since the last scan (an
+        # upload through another worker process, a deletion), so unknown IDs
+        # cost a stat rather than a directory listing
+        if self.paths.raw.stat().st_mtime_ns == self._raw_mtime_ns:
+            return None
+        self._scan_raw()
+        extension = self._extensions.get(document_id)
+        return self.paths.raw / f"{document_id}{extension}" if extension is not None else None
 
     def get_raw_file_content(self, document_id: str) -> bytes:
         """Get raw file content as bytes for processing."""
@@ -77,12 +113,19 @@ class LocalFileStorage:
         """Load OCR output text or raise if it doesn't exist."""
         document_id = self._validate_document_id(document_id)
         ocr_path = self.paths.ocr / f"{document_id}.txt"
-        if not ocr_path.exists():
+        try:
+            stat = ocr_path.stat()
+        except FileNotFoundError as exc:
             raise HTTPException(
                 status_code=404,
                 detail="OCR text not found. Run /documents/{id}/ocr first.",
-            )
-        return ocr_path.read_text(encoding="utf-8")
+            ) from exc
+        return _read_text_cached(ocr_path, stat.st_mtime_ns, stat.st_size)
+
+    def has_ocr_text(self, document_id: str) -> bool:
+        """Return whether OCR output has been saved, without loading it."""
+        document_id = self._validate_document_id(document_id)
+        return (self.paths.ocr / f"{document_id}.txt").is_file()
 
     def save_ocr_text(self, document_id: str, text: str) -> Path:
         """Persist OCR output for future reuse."""
@@ -95,7 +138,7 @@ class LocalFileStorage:
         """Store processed sentence data for later inspection."""
         document_id = self._validate_document_id(document_id)
         path = self.paths.sentences / f"{document_id}.json"
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         return path
 
     def load_sentences(self, document_id: str) -> dict[str, Any]:
@@ -107,15 +150,28 @@ class LocalFileStorage:
                 status_code=404,
                 detail="No sentence data found. Run /documents/{id}/sentences first.",
             )
-        return json.loads(path.read_text(encoding="utf-8"))
+        return orjson.loads(path.read_bytes())
+
+    def _scan_raw(self) -> None:
+        """Rebuild the extension index from a full listing of raw/."""
+        # Taken before listing, so files added during the scan change the
+        # mtime again and trigger another scan instead of being missed
+        mtime_ns = self.paths.raw.stat().st_mtime_ns
+        extensions: dict[str, str] = {}
+        with os.scandir(self.paths.raw) as entries:
+            for entry in entries:
+                stem, extension = os.path.splitext(entry.name)
+                if extension and entry.is_file():
+                    extensions[stem] = extension
+        with self._extensions_lock:
+            self._extensions = extensions
+            self._raw_mtime_ns = mtime_ns
 
     def _validate_document_id(self, document_id: str) -> str:
         """Ensure the supplied document ID is a canonical UUID string."""
-        try:
-            validated = uuid.UUID(str(document_id))
-        except (ValueError, AttributeError, TypeError) as exc:
-            raise HTTPException(status_code=400, detail="Invalid document_id format.") from exc
-        return str(validated)
+        if not isinstance(document_id, str) or not DOCUMENT_ID_PATTERN.match(document_id):
+            raise HTTPException(status_code=400, detail="Invalid document_id format.")
+        return document_id.lower()
 
     def _resolve_extension(self, file: UploadFile, content_type: str) -> str:
         """Determine the file extension for an upload based on its metadata."""
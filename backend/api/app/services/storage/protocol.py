@@ -32,6 +32,10 @@ class FileStorage(Protocol):
         """Load OCR output text or raise if it doesn't exist."""
         ...
 
+    def has_ocr_text(self, document_id: str) -> bool:
+        """Return whether OCR output has been saved, without loading it."""
+        ...
+
     def save_ocr_text(self, document_id: str, text: str) -> Path | str:
         """Persist OCR output for future reuse."""
         ...
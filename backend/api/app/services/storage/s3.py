@@ -14,21 +14,130 @@ The implementation handles AWS credential management flexibly, supporting:
 
 from __future__ import annotations
 
-import json
-import uuid
+import gzip
+import io
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from .ids import DOCUMENT_ID_PATTERN, new_document_id
 
 # File type detection constants
 PDF_CONTENT_TYPE = "application/pdf"
 IMAGE_PREFIX = "image/"
 DEFAULT_IMAGE_EXTENSION = ".jpg"
 
+# Large objects are transferred as concurrent multipart/ranged requests
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Throttling, 5xx and connection errors are retried by botocore itself with
+# capped exponential backoff and jitter; client errors such as 404 are not.
+# The pool is sized for the request threadpool plus concurrent transfers.
+CLIENT_CONFIG = Config(
+    retries={"mode": "standard", "max_attempts": 3},
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+
+# Clients are thread-safe and own their connection pool, so one is shared per
+# (region, profile) for the whole process
+_clients: dict[tuple[str, str], BaseClient] = {}
+_clients_lock = threading.Lock()
+
+# Decompressed OCR text/sentence bytes kept in memory per storage instance
+OBJECT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Derived text is stored gzip-compressed (Korean text shrinks ~3-5x)
+GZIP_ENCODING = "gzip"
+GZIP_LEVEL = 6
+# OCR text and sentences are rewritten when a document is processed again,
+# so caches in front of the bucket may only hold them briefly
+DERIVED_CACHE_CONTROL = "max-age=300"
+# Other API workers can rewrite them too, so the in-memory copies expire as well
+OBJECT_CACHE_TTL = 300
+CDN_TIMEOUT = 5
+
+
+class _ObjectCache:
+    """Thread-safe LRU of object bodies keyed by S3 key.
+
+    Entries expire after ``ttl`` seconds, and the least recently used ones are
+    evicted once the bodies add up to more than ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if time.monotonic() >= expires_at:
+                # Another worker may have rewritten the object since
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._discard(key)
+            if len(body) > self.max_bytes:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+def _get_client(region: str, aws_profile: str) -> BaseClient:
+    """Return the shared S3 client for ``region`` and ``aws_profile``."""
+    key = (region, aws_profile)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # Initialize S3 client using AWS profile or default credential chain
+            if aws_profile:
+                # Use named profile from ~/.aws/credentials
+                session = boto3.Session(profile_name=aws_profile)
+                client = session.client("s3", region_name=region, config=CLIENT_CONFIG)
+            else:
+                # Use default credential chain (environment variables, AWS CLI, IAM roles)
+                client = boto3.client("s3", region_name=region, config=CLIENT_CONFIG)
+            _clients[key] = client
+        return client
+
 
 class S3FileStorage:
     """S3-based file storage manager for uploaded documents and derived data."""
@@ -38,6 +147,7 @@ class S3FileStorage:
         bucket_name: str,
         region: str = "eu-west-3",
         aws_profile: str = "",
+        cdn_base_url: str = "",
     ):
         """Initialize S3 storage with bucket and credentials.
 
@@ -49,21 +159,27 @@ class S3FileStorage:
                          - Environment variables (AWS_PROFILE, AWS_ACCESS_KEY_ID, etc.)
                          - AWS CLI default credentials (~/.aws/credentials)
                          - IAM role (for EC2/ECS instances)
+            cdn_base_url: Optional CDN (e.g. CloudFront) origin for the bucket.
+                          When set, OCR text and sentences are read through it
+                          and fall back to S3 if the CDN request fails.
         """
         if not bucket_name:
             raise ValueError("S3 bucket name is required")
 
         self.bucket_name = bucket_name
         self.region = region
-
-        # Initialize S3 client using AWS profile or default credential chain
-        if aws_profile:
-            # Use named profile from ~/.aws/credentials
-            session = boto3.Session(profile_name=aws_profile)
-            self.s3_client = session.client("s3", region_name=region)
-        else:
-            # Use default credential chain (environment variables, AWS CLI, IAM roles)
-            self.s3_client = boto3.client("s3", region_name=region)
+        self.cdn_base_url = cdn_base_url.rstrip("/")
+        # OCR text and sentences only change when they are saved again; saves
+        # through this instance refresh the cache and entries expire in case
+        # another worker saved them (LRU, in-process)
+        self._object_cache = _ObjectCache(OBJECT_CACHE_MAX_BYTES, OBJECT_CACHE_TTL)
+        # document_id -> extension of its raw upload, filled on upload and on
+        # first lookup; raw objects are never rewritten, so entries stay valid
+        self._extensions: dict[str, str] = {}
+        self._extensions_lock = threading.Lock()
+
+        # Reuse the process-wide S3 client (and its warm connections)
+        self.s3_client = _get_client(region, aws_profile)
 
         # Verify bucket exists and is accessible at startup
         # This fails fast if there are configuration issues
@@ -101,25 +217,27 @@ class S3FileStorage:
         # Determine file extension based on content type
         extension = self._resolve_extension(file, content_type)
 
-        # Generate unique document ID (UUID v4)
-        document_id = str(uuid.uuid4())
+        # Generate unique, time-ordered document ID (UUID v7)
+        document_id = new_document_id()
         s3_key = f"raw/{document_id}{extension}"
 
         try:
-            # Read the entire file into memory
-            # For very large files (>100MB), consider using multipart upload
-            file_content = await file.read()
-
-            # Upload to S3 with proper content type and metadata
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                ContentType=content_type,
-                Metadata={
-                    "original_filename": file.filename or "",
-                    "document_id": document_id,
+            # Stream the spooled upload to S3; the transfer manager switches to
+            # concurrent multipart uploads for large files. The boto3 call
+            # blocks, so run it in the threadpool to keep the event loop free.
+            await run_in_threadpool(
+                self.s3_client.upload_fileobj,
+                file.file,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    "ContentType": content_type,
+                    "Metadata": {
+                        "original_filename": file.filename or "",
+                        "document_id": document_id,
+                    },
                 },
+                Config=TRANSFER_CONFIG,
             )
         except ClientError as exc:
             # S3-specific errors (permissions, quota, etc.)
@@ -130,6 +248,8 @@ class S3FileStorage:
             # Generic errors (network, etc.)
             raise HTTPException(status_code=500, detail="Failed to save file") from exc
 
+        with self._extensions_lock:
+            self._extensions[document_id] = extension
         return document_id
 
     def get_raw_file_path(self, document_id: str) -> str | None:
@@ -139,21 +259,30 @@ class S3FileStorage:
         This maintains interface compatibility with LocalFileStorage.
         """
         document_id = self._validate_document_id(document_id)
+        extension = self._extensions.get(document_id)
+        if extension is not None:
+            return f"raw/{document_id}{extension}"
 
-        # Try common file extensions to find the uploaded file
-        # We don't store the extension separately, so we check each possibility
-        # Using HEAD request is efficient - it doesn't download the file
-        for ext in [".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-            s3_key = f"raw/{document_id}{ext}"
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
-                return s3_key
-            except ClientError:
-                # File doesn't exist with this extension, try next one
-                continue
-
-        # No file found with any supported extension
-        return None
+        # Not indexed yet (uploaded before a restart or through another
+        # worker), so list the single object under the document's prefix:
+        # one round-trip whatever the extension
+        try:
+            response = self.s3_client.list_objects_v2(
+                Bucket=self.bucket_name, Prefix=f"raw/{document_id}.", MaxKeys=1
+            )
+        except ClientError as exc:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to look up file in S3: {exc}"
+            ) from exc
+
+        contents = response.get("Contents")
+        if not contents:
+            # No file found for this document
+            return None
+        s3_key = contents[0]["Key"]
+        with self._extensions_lock:
+            self._extensions[document_id] = Path(s3_key).suffix
+        return s3_key
 
     def get_raw_file_content(self, document_id: str) -> bytes:
         """Download and return the raw file content from S3.
@@ -167,10 +296,13 @@ class S3FileStorage:
             raise HTTPException(status_code=404, detail="Document not found")
 
         try:
-            # Download the file from S3
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            # Read the streaming body into bytes
-            return response["Body"].read()
+            # Download the file from S3; large files are fetched as concurrent
+            # ranged GETs written straight into the buffer
+            buffer = io.BytesIO()
+            self.s3_client.download_fileobj(
+                self.bucket_name, s3_key, buffer, Config=TRANSFER_CONFIG
+            )
+            return buffer.getvalue()
         except ClientError as exc:
             raise HTTPException(
                 status_code=500, detail=f"Failed to retrieve file from S3: {exc}"
@@ -179,16 +311,14 @@ class S3FileStorage:
     def load_ocr_text(self, document_id: str) -> str:
         """Load OCR output text from S3 or raise if it doesn't exist.
 
-        OCR results are stored as UTF-8 encoded text files in the 'ocr/' prefix.
+        OCR results are stored as gzip-compressed UTF-8 text in the 'ocr/' prefix.
         """
         document_id = self._validate_document_id(document_id)
         s3_key = f"ocr/{document_id}.txt"
 
         try:
-            # Fetch the text file from S3
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            # Decode from UTF-8 bytes to string
-            return response["Body"].read().decode("utf-8")
+            # Fetch the text file from S3 (or the in-memory cache) and decode
+            return self._get_object_body(s3_key).decode("utf-8")
         except ClientError as exc:
             error_code = exc.response.get("Error", {}).get("Code", "")
             if error_code == "NoSuchKey":
@@ -202,10 +332,32 @@ class S3FileStorage:
                 status_code=500, detail=f"Failed to load OCR text from S3: {exc}"
             ) from exc
 
+    def has_ocr_text(self, document_id: str) -> bool:
+        """Return whether OCR output exists in S3, using a HEAD request.
+
+        Only metadata is fetched, so polling this doesn't download the text.
+        """
+        document_id = self._validate_document_id(document_id)
+        s3_key = f"ocr/{document_id}.txt"
+        if self._object_cache.get(s3_key) is not None:
+            return True
+
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as exc:
+            # HEAD responses have no body, so a missing key is reported as a bare 404
+            error_code = exc.response.get("Error", {}).get("Code", "")
+            if error_code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise HTTPException(
+                status_code=500, detail=f"Failed to look up OCR text in S3: {exc}"
+            ) from exc
+        return True
+
     def save_ocr_text(self, document_id: str, text: str) -> str:
         """Persist OCR output to S3 for future reuse.
 
-        Stores extracted text as a UTF-8 encoded file in the 'ocr/' prefix.
+        Stores extracted text as a gzip-compressed UTF-8 file in the 'ocr/' prefix.
         This allows sentence processing and vocabulary extraction to be done
         without re-running OCR.
         """
@@ -214,13 +366,17 @@ class S3FileStorage:
 
         try:
             # Store text with proper encoding and content type
+            body = text.encode("utf-8")
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=text.encode("utf-8"),
+                Body=gzip.compress(body, compresslevel=GZIP_LEVEL),
                 ContentType="text/plain; charset=utf-8",
+                ContentEncoding=GZIP_ENCODING,
+                CacheControl=DERIVED_CACHE_CONTROL,
                 Metadata={"document_id": document_id},
             )
+            self._object_cache.put(s3_key, body)
         except ClientError as exc:
             raise HTTPException(
                 status_code=500, detail=f"Failed to save OCR text to S3: {exc}"
@@ -231,25 +387,27 @@ class S3FileStorage:
     def save_sentences(self, document_id: str, data: Mapping[str, Any]) -> str:
         """Store processed sentence data to S3 for later inspection.
 
-        Sentences are stored as JSON with UTF-8 encoding in the 'sentences/' prefix.
-        The ensure_ascii=False preserves Korean characters properly.
+        Sentences are stored as gzip-compressed UTF-8 JSON in the 'sentences/' prefix.
+        orjson writes UTF-8 directly, so Korean characters are preserved as-is.
         """
         document_id = self._validate_document_id(document_id)
         s3_key = f"sentences/{document_id}.json"
 
         try:
-            # Serialize to JSON with proper Unicode handling
-            # ensure_ascii=False preserves Korean and other non-ASCII characters
-            json_content = json.dumps(data, ensure_ascii=False, indent=2)
+            # orjson emits compact UTF-8 directly, keeping Korean characters as-is
+            body = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
 
-            # Upload JSON with proper content type
+            # Upload compressed JSON with proper content type
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=json_content.encode("utf-8"),
+                Body=gzip.compress(body, compresslevel=GZIP_LEVEL),
                 ContentType="application/json; charset=utf-8",
+                ContentEncoding=GZIP_ENCODING,
+                CacheControl=DERIVED_CACHE_CONTROL,
                 Metadata={"document_id": document_id},
             )
+            self._object_cache.put(s3_key, body)
         except ClientError as exc:
             raise HTTPException(
                 status_code=500, detail=f"Failed to save sentences to S3: {exc}"
@@ -266,11 +424,9 @@ class S3FileStorage:
         s3_key = f"sentences/{document_id}.json"
 
         try:
-            # Download JSON file from S3
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            content = response["Body"].read().decode("utf-8")
-            # Parse JSON and return as dictionary
-            return json.loads(content)
+            # Download JSON file from S3 (or the in-memory cache) and parse the
+            # UTF-8 bytes directly into a dictionary
+            return orjson.loads(self._get_object_body(s3_key))
         except ClientError as exc:
             error_code = exc.response.get("Error", {}).get("Code", "")
             if error_code == "NoSuchKey":
@@ -284,21 +440,48 @@ class S3FileStorage:
                 status_code=500, detail=f"Failed to load sentences from S3: {exc}"
             ) from exc
 
+    def _get_object_body(self, s3_key: str) -> bytes:
+        """Return an object's body, serving repeat reads from memory."""
+        body = self._object_cache.get(s3_key)
+        if body is None and self.cdn_base_url:
+            body = self._get_object_body_from_cdn(s3_key)
+            if body is not None:
+                self._object_cache.put(s3_key, body)
+        if body is None:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            body = response["Body"].read()
+            # Objects written before compression was introduced are plain
+            if response.get("ContentEncoding") == GZIP_ENCODING:
+                body = gzip.decompress(body)
+            self._object_cache.put(s3_key, body)
+        return body
+
+    def _get_object_body_from_cdn(self, s3_key: str) -> bytes | None:
+        """Fetch an object through the CDN, or return None to fall back to S3."""
+        request = urllib.request.Request(
+            f"{self.cdn_base_url}/{s3_key}", headers={"Accept-Encoding": GZIP_ENCODING}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=CDN_TIMEOUT) as response:
+                body = response.read()
+                encoding = response.headers.get("Content-Encoding")
+        except (OSError, ValueError):
+            # Cache misses racing a fresh upload, CDN outages, bad URLs...
+            return None
+        return gzip.decompress(body) if encoding == GZIP_ENCODING else body
+
     def _validate_document_id(self, document_id: str) -> str:
         """Ensure the supplied document ID is a canonical UUID string.
 
         This prevents path traversal attacks and ensures consistent formatting.
         UUIDs are validated and normalized to lowercase hyphenated format.
         """
-        try:
-            # Validate and normalize the UUID
-            # This will raise ValueError if the string is not a valid UUID
-            validated = uuid.UUID(str(document_id))
-        except (ValueError, AttributeError, TypeError) as exc:
-            raise HTTPException(status_code=400, detail="Invalid document_id format.") from exc
+        # A precompiled pattern check avoids parsing through uuid.UUID
+        if not isinstance(document_id, str) or not DOCUMENT_ID_PATTERN.match(document_id):
+            raise HTTPException(status_code=400, detail="Invalid document_id format.")
 
         # Return normalized UUID string (lowercase with hyphens)
-        return str(validated)
+        return document_id.lower()
 
     def _resolve_extension(self, file: UploadFile, content_type: str) -> str:
         """Determine the file extension for an upload based on its metadata.
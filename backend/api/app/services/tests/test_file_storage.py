@@ -1,7 +1,12 @@
-"""Tests for LocalFileStorage document ID validation."""
+"""Tests for LocalFileStorage uploads, persistence and document ID validation."""
+
+import asyncio
+import io
+import uuid
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
 
 from services.storage import LocalFileStorage
 
@@ -14,3 +19,112 @@ def test_load_ocr_text_rejects_invalid_document_id(tmp_path):
 
     assert excinfo.value.status_code == 400
     assert "document_id" in excinfo.value.detail
+
+
+def test_validate_document_id_normalizes_case(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+
+    assert (
+        storage._validate_document_id("123E4567-E89B-12D3-A456-426614174000")
+        == "123e4567-e89b-12d3-a456-426614174000"
+    )
+
+
+def test_save_uploaded_file_streams_content_to_disk(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+    content = b"%PDF-1.4" + b"x" * (3 * 1024 * 1024)
+    upload = UploadFile(
+        file=io.BytesIO(content),
+        filename="scan.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+    document_id = asyncio.run(storage.save_uploaded_file(upload))
+
+    assert storage.get_raw_file_content(document_id) == content
+    assert storage.get_raw_file_path(document_id).suffix == ".pdf"
+
+
+def test_get_raw_file_path_finds_files_present_at_startup(tmp_path):
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    (raw_dir / f"{document_id}.png").write_bytes(b"png")
+
+    storage = LocalFileStorage(tmp_path)
+
+    assert storage.get_raw_file_path(document_id) == raw_dir / f"{document_id}.png"
+    assert storage.get_raw_file_path("123e4567-e89b-12d3-a456-426614174001") is None
+
+
+def test_get_raw_file_path_rescans_only_after_raw_dir_changes(tmp_path, monkeypatch):
+    storage = LocalFileStorage(tmp_path)
+    scans = []
+    scan_raw = storage._scan_raw
+    monkeypatch.setattr(storage, "_scan_raw", lambda: scans.append(True) or scan_raw())
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+
+    assert storage.get_raw_file_path(document_id) is None
+    assert storage.get_raw_file_path(document_id) is None
+    assert not scans
+
+    # Stored by another worker process, so only the directory listing knows it
+    (tmp_path / "raw" / f"{document_id}.jpg").write_bytes(b"jpg")
+
+    assert storage.get_raw_file_path(document_id) == tmp_path / "raw" / f"{document_id}.jpg"
+    assert storage.get_raw_file_path("123e4567-e89b-12d3-a456-426614174001") is None
+    assert len(scans) == 1
+
+
+def test_sentences_round_trip_preserves_korean(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    payload = {
+        "document_id": document_id,
+        "sentences": ["오늘은 이 옷으로 정했어!"],
+        "sentence_count": 1,
+    }
+
+    path = storage.save_sentences(document_id, payload)
+
+    assert "오늘은" in path.read_text(encoding="utf-8")
+    assert storage.load_sentences(document_id) == payload
+
+
+def test_uploaded_document_ids_are_time_ordered(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+
+    def upload() -> str:
+        file = UploadFile(
+            file=io.BytesIO(b"png"),
+            filename="page.png",
+            headers=Headers({"content-type": "image/png"}),
+        )
+        return asyncio.run(storage.save_uploaded_file(file))
+
+    document_ids = [upload() for _ in range(5)]
+
+    assert all(uuid.UUID(document_id).version == 7 for document_id in document_ids)
+    assert [document_id[:13] for document_id in document_ids] == sorted(
+        document_id[:13] for document_id in document_ids
+    )
+
+
+def test_has_ocr_text_reports_saved_text(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+
+    assert not storage.has_ocr_text(document_id)
+    storage.save_ocr_text(document_id, "안녕하세요")
+    assert storage.has_ocr_text(document_id)
+
+
+def test_load_ocr_text_sees_rewritten_text(tmp_path):
+    storage = LocalFileStorage(tmp_path)
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+
+    storage.save_ocr_text(document_id, "첫 번째")
+    assert storage.load_ocr_text(document_id) == "첫 번째"
+
+    storage.save_ocr_text(document_id, "두 번째 결과")
+    assert storage.load_ocr_text(document_id) == "두 번째 결과"
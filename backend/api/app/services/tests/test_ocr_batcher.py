@@ -0,0 +1,82 @@
+"""Tests for OCRBatcher request aggregation."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from services.processing import OCRBatcher
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.batches: list[list[tuple[bytes, str]]] = []
+
+    def extract_text_batch(self, documents):
+        self.batches.append(list(documents))
+        if any(content == b"bad" for content, _ in documents):
+            raise HTTPException(status_code=400, detail="Failed to process image")
+        return [content.decode() for content, _ in documents]
+
+    def extract_text_from_bytes(self, file_content, file_extension):
+        return self.extract_text_batch([(file_content, file_extension)])[0]
+
+
+def _run_with_batcher(processor, coroutine_factory, **kwargs):
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = OCRBatcher(processor, executor, **kwargs)
+            batcher.start()
+            try:
+                return await coroutine_factory(batcher)
+            finally:
+                await batcher.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_requests_are_dispatched_together():
+    processor = FakeProcessor()
+
+    async def submit_all(batcher):
+        return await asyncio.gather(
+            *(batcher.submit(f"page {index}".encode(), ".png") for index in range(3))
+        )
+
+    texts = _run_with_batcher(processor, submit_all, max_batch_size=8, max_wait=0.05)
+
+    assert texts == ["page 0", "page 1", "page 2"]
+    assert len(processor.batches) == 1
+
+
+def test_failing_document_only_fails_its_own_request():
+    processor = FakeProcessor()
+
+    async def submit_all(batcher):
+        return await asyncio.gather(
+            batcher.submit(b"good", ".png"),
+            batcher.submit(b"bad", ".png"),
+            return_exceptions=True,
+        )
+
+    good, bad = _run_with_batcher(processor, submit_all, max_wait=0.05)
+
+    assert good == "good"
+    assert isinstance(bad, HTTPException)
+    assert bad.status_code == 400
+
+
+def test_full_queue_rejects_with_503():
+    processor = FakeProcessor()
+
+    async def overflow(batcher):
+        batcher._queue.put_nowait(object())
+        with pytest.raises(HTTPException) as excinfo:
+            await batcher.submit(b"late", ".png")
+        batcher._queue.get_nowait()
+        return excinfo.value
+
+    error = _run_with_batcher(processor, overflow, max_queue_size=1)
+
+    assert error.status_code == 503
@@ -0,0 +1,103 @@
+"""Tests for the background OCR job endpoints."""
+
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.services import OCRBatcher, OCRProcessor
+from app.services.storage import LocalFileStorage
+from fastapi.testclient import TestClient
+
+DOCUMENT_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch):
+    # main builds its services from settings on first import only, so keep that
+    # import out of the working tree and give every test its own services
+    monkeypatch.setenv("LOCAL_DATA_DIR", str(tmp_path))
+    module = importlib.import_module("app.main")
+    storage = LocalFileStorage(tmp_path)
+    (storage.paths.raw / f"{DOCUMENT_ID}.png").write_bytes(b"png")
+    processor = OCRProcessor(use_gpu=False, cache_dir=tmp_path / "ocr")
+    monkeypatch.setattr(module, "file_storage", storage)
+    monkeypatch.setattr(module, "ocr_processor", processor)
+    # The batcher binds to the event loop of the app it was started in
+    monkeypatch.setattr(
+        module, "ocr_batcher", OCRBatcher(processor, ThreadPoolExecutor(max_workers=1))
+    )
+    monkeypatch.setattr(module.settings, "ocr_warmup", False)
+    monkeypatch.setattr(module.settings, "text_warmup", False)
+    monkeypatch.setattr(module, "ocr_jobs", {})
+    return module
+
+
+def _wait_for_status(client: TestClient, status: str) -> dict[str, str]:
+    deadline = time.monotonic() + 5
+    while True:
+        body = client.get(f"/documents/{DOCUMENT_ID}/ocr/status").json()
+        if body["status"] == status or time.monotonic() > deadline:
+            return body
+        time.sleep(0.01)
+
+
+def test_ocr_job_reports_processing_then_done(main, monkeypatch):
+    release = threading.Event()
+
+    async def fake_submit(file_content, file_extension):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return "안녕하세요"
+
+    monkeypatch.setattr(main.ocr_batcher, "submit", fake_submit)
+
+    with TestClient(main.app) as client:
+        assert client.get(f"/documents/{DOCUMENT_ID}/ocr/status").json()["status"] == (
+            "not_started"
+        )
+        response = client.post(f"/documents/{DOCUMENT_ID}/ocr/jobs")
+        assert response.status_code == 202
+        assert response.json()["status"] == "processing"
+        assert _wait_for_status(client, "processing")["status"] == "processing"
+
+        release.set()
+
+        assert _wait_for_status(client, "done")["status"] == "done"
+    assert main.file_storage.load_ocr_text(DOCUMENT_ID) == "안녕하세요"
+    assert not main.ocr_jobs
+
+
+def test_ocr_job_reports_failure_until_it_expires(main, monkeypatch):
+    async def failing_submit(file_content, file_extension):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(main.ocr_batcher, "submit", failing_submit)
+    monkeypatch.setattr(main.settings, "ocr_failed_job_ttl", 0.2)
+
+    with TestClient(main.app) as client:
+        client.post(f"/documents/{DOCUMENT_ID}/ocr/jobs")
+
+        assert _wait_for_status(client, "failed") == {
+            "document_id": DOCUMENT_ID,
+            "status": "failed",
+            "detail": "OCR failed.",
+        }
+        assert _wait_for_status(client, "not_started")["status"] == "not_started"
+    assert not main.ocr_jobs
+
+
+def test_ocr_status_does_not_load_the_text(main, monkeypatch):
+    main.file_storage.save_ocr_text(DOCUMENT_ID, "안녕하세요")
+
+    def fail_load(document_id):
+        raise AssertionError("status polling must not read the OCR text")
+
+    monkeypatch.setattr(main.file_storage, "load_ocr_text", fail_load)
+
+    with TestClient(main.app) as client:
+        assert client.get(f"/documents/{DOCUMENT_ID}/ocr/status").json()["status"] == "done"
+        missing = client.get("/documents/123e4567-e89b-12d3-a456-426614174001/ocr/status")
+    assert missing.status_code == 404
@@ -0,0 +1,401 @@
+"""Tests for OCRProcessor caching, batching and PDF handling."""
+
+import io
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pymupdf
+import pytest
+import torch
+from fastapi import HTTPException
+from PIL import Image
+
+from services.processing import OCRProcessor
+from services.processing import ocr as ocr_module
+from services.processing.ocr import (
+    PDF_RENDER_CHUNK_PAGES,
+    RENDER_AHEAD_BATCHES,
+    _prefetch,
+    _render_chunk_pages,
+    _use_half_precision,
+)
+
+
+def _png_bytes(color: str = "white") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _counting_processor(monkeypatch, **kwargs) -> tuple[OCRProcessor, list[object]]:
+    processor = OCRProcessor(use_gpu=False, **kwargs)
+    calls: list[object] = []
+
+    def fake_run_ocr_batch(images):
+        calls.extend(images)
+        return ["안녕하세요"] * len(images)
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", fake_run_ocr_batch)
+    return processor, calls
+
+
+def test_extract_text_from_bytes_reuses_cached_result(tmp_path, monkeypatch):
+    processor, calls = _counting_processor(monkeypatch, cache_dir=tmp_path)
+    content = _png_bytes()
+
+    first = processor.extract_text_from_bytes(content, ".png")
+    second = processor.extract_text_from_bytes(content, ".png")
+
+    assert first == second == "안녕하세요"
+    assert len(calls) == 1
+    # A single image is cached once, under its document key only
+    assert len(list(tmp_path.glob("cache_*.txt"))) == 1
+
+
+def test_extract_text_from_bytes_cache_opt_out(tmp_path, monkeypatch):
+    processor, calls = _counting_processor(monkeypatch, cache_dir=tmp_path, use_cache=False)
+    content = _png_bytes()
+
+    processor.extract_text_from_bytes(content, ".png")
+    processor.extract_text_from_bytes(content, ".png")
+
+    assert len(calls) == 2
+    assert not list(tmp_path.iterdir())
+
+
+def test_cache_key_separates_documents_pages_and_settings(tmp_path):
+    processor = OCRProcessor(use_gpu=False, cache_dir=tmp_path)
+    fp32 = OCRProcessor(use_gpu=False, cache_dir=tmp_path, precision="fp32")
+    uncached = OCRProcessor(use_gpu=False, cache_dir=tmp_path, use_cache=False)
+    content = _png_bytes()
+
+    document_key = processor._cache_key(ocr_module.DOCUMENT_CACHE_PERSON, content)
+
+    assert document_key != processor._cache_key(ocr_module.PAGE_CACHE_PERSON, content)
+    assert document_key != fp32._cache_key(ocr_module.DOCUMENT_CACHE_PERSON, content)
+    assert uncached._cache_key(ocr_module.DOCUMENT_CACHE_PERSON, content) is None
+
+
+def test_write_cache_prunes_least_recently_used_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_module, "CACHE_PRUNE_INTERVAL", 1)
+    processor, calls = _counting_processor(monkeypatch, cache_dir=tmp_path, cache_max_entries=2)
+
+    for color in ("white", "black", "red"):
+        processor.extract_text_from_bytes(_png_bytes(color), ".png")
+
+    assert len(list(tmp_path.glob("cache_*.txt"))) == 2
+    processor.extract_text_from_bytes(_png_bytes("red"), ".png")
+    assert len(calls) == 3
+
+
+def test_extract_text_from_bytes_downscales_large_images(monkeypatch):
+    processor, calls = _counting_processor(monkeypatch, max_image_edge=100)
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 200), "white").save(buffer, format="PNG")
+
+    processor.extract_text_from_bytes(buffer.getvalue(), ".png")
+    processor.extract_text_from_bytes(_png_bytes(), ".png")
+
+    assert [image.shape for image in calls] == [(50, 100, 3), (8, 8, 3)]
+
+
+def test_run_ocr_pages_batches_pages_of_equal_size(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, batch_size=2)
+    batches: list[list[tuple[int, ...]]] = []
+
+    def fake_run_ocr_batch(images):
+        batches.append([image.shape for image in images])
+        return [f"{image.shape[1]}x{image.shape[0]}" for image in images]
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", fake_run_ocr_batch)
+    sizes = [(10, 20), (30, 40), (10, 20), (10, 20)]
+    pages = [np.zeros((height, width, 3), dtype=np.uint8) for width, height in sizes]
+
+    texts = processor._run_ocr_pages(pages)
+
+    assert texts == ["10x20", "30x40", "10x20", "10x20"]
+    assert batches == [[(20, 10, 3), (20, 10, 3)], [(20, 10, 3)], [(40, 30, 3)]]
+
+
+def test_run_ocr_pages_streams_pages_into_batches(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, batch_size=2)
+    produced: list[int] = []
+    produced_at_batch: list[int] = []
+
+    def fake_run_ocr_batch(images):
+        produced_at_batch.append(len(produced))
+        return [""] * len(images)
+
+    def pages():
+        for number in range(5):
+            produced.append(number)
+            yield np.zeros((4, 4, 3), dtype=np.uint8)
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", fake_run_ocr_batch)
+
+    processor._run_ocr_pages(pages())
+
+    assert produced_at_batch == [2, 4, 5]
+
+
+def test_run_ocr_pages_flushes_partial_batches_while_idle(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, batch_size=4)
+    batches: list[int] = []
+
+    def fake_run_ocr_batch(images):
+        batches.append(len(images))
+        return [""] * len(images)
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", fake_run_ocr_batch)
+    page = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    processor._run_ocr_pages([page, None, page, page, page])
+
+    assert batches == [1, 3]
+
+
+def test_prefetch_keeps_order_and_reports_idle_time():
+    def slow_items():
+        yield 1
+        time.sleep(0.05)
+        yield 2
+
+    items = list(_prefetch(slow_items(), depth=1, idle_timeout=0.01))
+
+    assert [item for item in items if item is not None] == [1, 2]
+    assert None in items
+
+
+def test_prefetch_reraises_producer_errors():
+    def failing_items():
+        yield 1
+        raise HTTPException(status_code=400, detail="No pages detected in PDF.")
+
+    stream = _prefetch(failing_items(), depth=1, idle_timeout=1.0)
+
+    assert next(stream) == 1
+    with pytest.raises(HTTPException):
+        next(stream)
+
+
+def test_extract_text_batch_stops_prefetch_when_ocr_fails(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, batch_size=1)
+
+    def failing_run_ocr_batch(images):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", failing_run_ocr_batch)
+    documents = [(_png_bytes(), ".png") for _ in range(8)]
+
+    # Holding the traceback keeps the OCR frames, and any unclosed stream, alive
+    with pytest.raises(RuntimeError) as excinfo:
+        processor.extract_text_batch(documents)
+
+    assert excinfo.value.__traceback__ is not None
+    assert not any(thread.name == "ocr-prefetch" for thread in threading.enumerate())
+
+
+def test_extract_text_from_bytes_uses_pdf_text_layer(monkeypatch):
+    processor, calls = _counting_processor(monkeypatch)
+    sentence = "The quick brown fox jumps over the lazy dog, twice over."
+    document = pymupdf.open()
+    document.new_page().insert_text((72, 72), sentence)
+
+    text = processor.extract_text_from_bytes(document.tobytes(), ".pdf")
+
+    assert text == sentence
+    assert not calls
+
+
+def test_extract_text_from_bytes_ocrs_scanned_pages_of_mixed_pdf(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, pdf_dpi=72, render_workers=2)
+    widths: list[int] = []
+
+    def fake_run_ocr_batch(images):
+        widths.extend(image.shape[1] for image in images)
+        return [f"scan {image.shape[1]}" for image in images]
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", fake_run_ocr_batch)
+    # Enough cover text to clear the threshold for the whole document on its own
+    cover = "\n".join(["The quick brown fox jumps over the lazy dog, twice over."] * 10)
+    document = pymupdf.open()
+    document.new_page(width=300, height=200).insert_text((10, 20), cover, fontsize=8)
+    for number in range(9):
+        document.new_page(width=72 + number, height=72)
+
+    text = processor.extract_text_from_bytes(document.tobytes(), ".pdf")
+
+    assert sorted(widths) == [72 + number for number in range(9)]
+    assert text == "\n\n".join([cover] + [f"scan {72 + number}" for number in range(9)])
+
+
+def test_extract_text_from_bytes_joins_stripped_non_empty_pages(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, pdf_dpi=72, render_workers=1)
+    monkeypatch.setattr(processor, "_run_ocr_batch", lambda images: [" 첫 ", "  ", "둘 \n"])
+    document = pymupdf.open()
+    for _ in range(3):
+        document.new_page(width=72, height=72)
+
+    text = processor.extract_text_from_bytes(document.tobytes(), ".pdf")
+
+    assert text == "첫\n\n둘"
+
+
+def test_extract_text_batch_shares_ocr_calls_between_documents(monkeypatch):
+    processor, calls = _counting_processor(monkeypatch)
+    batches: list[int] = []
+    fake_run_ocr_batch = processor._run_ocr_batch
+
+    def recording_run_ocr_batch(images):
+        batches.append(len(images))
+        return fake_run_ocr_batch(images)
+
+    monkeypatch.setattr(processor, "_run_ocr_batch", recording_run_ocr_batch)
+
+    texts = processor.extract_text_batch(
+        [(_png_bytes("white"), ".png"), (_png_bytes("black"), ".jpg")]
+    )
+
+    assert texts == ["안녕하세요", "안녕하세요"]
+    assert batches == [2]
+
+
+def test_run_ocr_batch_retries_after_cuda_out_of_memory(monkeypatch):
+    processor = OCRProcessor(use_gpu=False)
+    monkeypatch.setattr("services.retry.time.sleep", lambda _delay: None)
+    released: list[bool] = []
+    monkeypatch.setattr(torch.cuda, "empty_cache", lambda: released.append(True))
+    attempts: list[int] = []
+
+    class FlakyReader:
+        def readtext_batched(self, images, batch_size):
+            attempts.append(len(images))
+            if len(attempts) == 1:
+                raise torch.cuda.OutOfMemoryError("CUDA out of memory")
+            return [[(None, "안녕", 0.9)] for _ in images]
+
+    processor._reader = FlakyReader()
+
+    assert processor._run_ocr_batch([np.zeros((4, 4, 3), dtype=np.uint8)]) == ["안녕"]
+    assert attempts == [1, 1]
+    assert released == [True]
+
+
+def test_run_ocr_batch_runs_in_inference_mode():
+    processor = OCRProcessor(use_gpu=False)
+    modes: list[bool] = []
+
+    class RecordingReader:
+        def readtext_batched(self, images, batch_size):
+            modes.append(torch.is_inference_mode_enabled())
+            return [[] for _ in images]
+
+    processor._reader = RecordingReader()
+
+    assert processor._run_ocr_batch([np.zeros((4, 4, 3), dtype=np.uint8)]) == [""]
+    assert modes == [True]
+
+
+def test_processors_share_one_reader_per_configuration(monkeypatch):
+    created: list[tuple] = []
+
+    class FakeReader:
+        device = "cpu"
+
+        def __init__(self, languages, gpu, quantize, cudnn_benchmark):
+            created.append((tuple(languages), gpu, quantize))
+
+    monkeypatch.setattr(ocr_module.easyocr, "Reader", FakeReader)
+    monkeypatch.setattr(ocr_module, "_readers", {})
+
+    first = OCRProcessor(use_gpu=False)._get_reader()
+    second = OCRProcessor(use_gpu=False)._get_reader()
+    other = OCRProcessor(use_gpu=False, precision="fp32")._get_reader()
+
+    assert first is second
+    assert other is not first
+    assert created == [(("ko", "en"), False, True), (("ko", "en"), False, False)]
+
+
+def test_half_precision_module_keeps_float32_interface():
+    module = torch.nn.Linear(4, 2)
+
+    _use_half_precision(module)
+    output = module(torch.ones(1, 4))
+
+    assert module.weight.dtype == torch.float16
+    assert output.dtype == torch.float32
+
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError, match="precision"):
+        OCRProcessor(use_gpu=False, precision="fp8")
+
+
+def test_convert_pdf_to_images_renders_page_ranges_in_parallel():
+    document = pymupdf.open()
+    for number in range(PDF_RENDER_CHUNK_PAGES * 2 + 1):
+        document.new_page(width=72 + number, height=72)
+    content = document.tobytes()
+
+    sequential = OCRProcessor(use_gpu=False, pdf_dpi=72, render_workers=1)
+    parallel = OCRProcessor(use_gpu=False, pdf_dpi=72, render_workers=2)
+
+    expected = list(sequential._convert_pdf_to_images(content))
+    pages = list(parallel._convert_pdf_to_images(content))
+
+    assert [page.shape for page in pages] == [page.shape for page in expected]
+    assert [page.shape[1] for page in pages] == [72 + n for n in range(len(pages))]
+
+
+@pytest.mark.parametrize(
+    ("page_budget", "workers", "expected"),
+    [(8, 2, 4), (8, 3, 2), (8, 16, 1)],
+)
+def test_render_chunk_pages_splits_budget_between_workers(page_budget, workers, expected):
+    assert _render_chunk_pages(page_budget, workers) == expected
+
+
+def test_convert_pdf_to_images_bounds_pages_rendered_ahead(monkeypatch):
+    processor = OCRProcessor(use_gpu=False, pdf_dpi=72, batch_size=2, render_workers=8)
+    submitted: list[int] = []
+
+    class ImmediatePool:
+        def submit(self, _render, _pdf_path, _dpi, numbers):
+            submitted.extend(numbers)
+            future: Future[list[np.ndarray]] = Future()
+            future.set_result([np.zeros((1, 1, 3), dtype=np.uint8) for _ in numbers])
+            return future
+
+    monkeypatch.setattr(ocr_module, "_get_render_pool", lambda _workers: ImmediatePool())
+    document = pymupdf.open()
+    for _ in range(40):
+        document.new_page(width=72, height=72)
+
+    held: list[int] = []
+    for consumed, _page in enumerate(processor._convert_pdf_to_images(document.tobytes()), 1):
+        held.append(len(submitted) - consumed + 1)
+
+    assert len(submitted) == 40
+    assert max(held) <= RENDER_AHEAD_BATCHES * processor.batch_size
+
+
+def test_convert_pdf_to_images_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    processor = OCRProcessor(use_gpu=False, pdf_dpi=72, render_workers=2)
+
+    class BrokenPool:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(ocr_module, "_get_render_pool", lambda _workers: BrokenPool())
+    monkeypatch.setattr(ocr_module, "SHARED_MEMORY_DIR", str(tmp_path))
+    document = pymupdf.open()
+    for _ in range(PDF_RENDER_CHUNK_PAGES + 1):
+        document.new_page(width=72, height=72)
+
+    with pytest.raises(HTTPException):
+        list(processor._convert_pdf_to_images(document.tobytes()))
+
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,57 @@
+"""Tests for the retry decorator."""
+
+import pytest
+
+from services import retry as retry_module
+from services.retry import retry
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays: list[float] = []
+    monkeypatch.setattr(retry_module.time, "sleep", delays.append)
+    return delays
+
+
+def _flaky(failures: int, exc: type[Exception] = ConnectionError):
+    calls: list[int] = []
+
+    def func() -> str:
+        calls.append(len(calls))
+        if len(calls) <= failures:
+            raise exc("transient")
+        return "ok"
+
+    return func, calls
+
+
+def test_retry_backs_off_until_success(sleeps):
+    func, calls = _flaky(failures=2)
+    released: list[BaseException] = []
+
+    wrapped = retry(ConnectionError, base=0.5, on_retry=released.append)(func)
+
+    assert wrapped() == "ok"
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert len(released) == 2
+
+
+def test_retry_gives_up_after_tries(sleeps):
+    func, calls = _flaky(failures=5)
+
+    with pytest.raises(ConnectionError):
+        retry(ConnectionError, tries=3, base=4.0, cap=6.0)(func)()
+
+    assert len(calls) == 3
+    assert sleeps == [4.0, 6.0]
+
+
+def test_retry_ignores_other_exceptions(sleeps):
+    func, calls = _flaky(failures=1, exc=ValueError)
+
+    with pytest.raises(ValueError):
+        retry(ConnectionError)(func)()
+
+    assert len(calls) == 1
+    assert not sleeps
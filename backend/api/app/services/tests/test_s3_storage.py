@@ -1,12 +1,25 @@
 """Tests for S3FileStorage."""
 
+import asyncio
+import gzip
+import io
+import urllib.error
 from unittest.mock import MagicMock, patch
 
 import pytest
 from botocore.exceptions import ClientError
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
 
-from services.storage import S3FileStorage
+from services.storage import S3FileStorage, s3
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Make every test build its own (mocked) S3 client."""
+    s3._clients.clear()
+    yield
+    s3._clients.clear()
 
 
 @pytest.fixture
@@ -32,6 +45,25 @@ def test_s3_storage_initialization(mock_s3_client):
     mock_s3_client.head_bucket.assert_called_once_with(Bucket="test-bucket")
 
 
+def test_s3_storage_configures_client_retries():
+    """Test the S3 client is created with bounded botocore retries."""
+    with patch("services.storage.s3.boto3.client") as mock_boto:
+        mock_boto.return_value.head_bucket.return_value = {}
+        S3FileStorage(bucket_name="test-bucket")
+
+    config = mock_boto.call_args.kwargs["config"]
+    assert config.retries == {"mode": "standard", "max_attempts": 3}
+
+
+def test_s3_storage_instances_share_a_client(mock_s3_client):
+    """Test storages for the same region and profile reuse one client."""
+    first = S3FileStorage(bucket_name="test-bucket")
+    second = S3FileStorage(bucket_name="other-bucket")
+
+    assert first.s3_client is second.s3_client is mock_s3_client
+    assert mock_s3_client.head_bucket.call_count == 2
+
+
 def test_s3_storage_requires_bucket_name(mock_s3_client):
     """Test that bucket name is required."""
     with pytest.raises(ValueError, match="bucket name is required"):
@@ -67,6 +99,36 @@ def test_validate_document_id_rejects_invalid(mock_s3_client):
     assert "document_id" in excinfo.value.detail
 
 
+def test_validate_document_id_normalizes_case(mock_s3_client):
+    """Test canonical UUIDs are accepted and lowercased; other forms are not."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+
+    assert (
+        storage._validate_document_id("123E4567-E89B-12D3-A456-426614174000")
+        == "123e4567-e89b-12d3-a456-426614174000"
+    )
+    with pytest.raises(HTTPException):
+        storage._validate_document_id("123e4567e89b12d3a456426614174000")
+
+
+def test_save_uploaded_file_streams_to_s3(mock_s3_client):
+    """Test uploads are streamed from the spooled file, not read into memory."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    upload = UploadFile(
+        file=io.BytesIO(b"%PDF-1.4"),
+        filename="scan.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+    document_id = asyncio.run(storage.save_uploaded_file(upload))
+
+    call = mock_s3_client.upload_fileobj.call_args
+    assert call.args == (upload.file, "test-bucket", f"raw/{document_id}.pdf")
+    assert call.kwargs["ExtraArgs"]["ContentType"] == "application/pdf"
+    assert call.kwargs["ExtraArgs"]["Metadata"]["original_filename"] == "scan.pdf"
+    mock_s3_client.put_object.assert_not_called()
+
+
 def test_save_ocr_text_uses_correct_key(mock_s3_client):
     """Test that OCR text is saved with correct S3 key."""
     storage = S3FileStorage(bucket_name="test-bucket")
@@ -78,7 +140,64 @@ def test_save_ocr_text_uses_correct_key(mock_s3_client):
     call_kwargs = mock_s3_client.put_object.call_args.kwargs
     assert call_kwargs["Bucket"] == "test-bucket"
     assert call_kwargs["Key"] == f"ocr/{document_id}.txt"
-    assert call_kwargs["Body"] == b"Test OCR text"
+    assert gzip.decompress(call_kwargs["Body"]) == b"Test OCR text"
+    assert call_kwargs["ContentEncoding"] == "gzip"
+    assert call_kwargs["CacheControl"] == "max-age=300"
+
+
+def test_save_sentences_keeps_korean_text_compact(mock_s3_client):
+    """Test sentence JSON is compact UTF-8 and round-trips through the cache."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    data = {"sentences": ["안녕하세요."], "count": 1}
+
+    storage.save_sentences(document_id, data)
+
+    body = gzip.decompress(mock_s3_client.put_object.call_args.kwargs["Body"])
+    assert body == '{"sentences":["안녕하세요."],"count":1}'.encode()
+    assert storage.load_sentences(document_id) == data
+    mock_s3_client.get_object.assert_not_called()
+
+
+def test_load_ocr_text_reads_through_cdn(mock_s3_client, monkeypatch):
+    """Test a configured CDN serves reads, with S3 as the fallback."""
+    requests = []
+
+    class FakeResponse(io.BytesIO):
+        headers = {"Content-Encoding": "gzip"}
+
+    def fake_urlopen(request, timeout):
+        requests.append(request)
+        if request.full_url.endswith("-426614174000.txt"):
+            return FakeResponse(gzip.compress("씨디엔".encode()))
+        raise urllib.error.HTTPError(request.full_url, 404, "Not Found", {}, None)
+
+    monkeypatch.setattr(s3.urllib.request, "urlopen", fake_urlopen)
+    mock_s3_client.get_object.return_value = {"Body": io.BytesIO("에스삼".encode())}
+    storage = S3FileStorage(bucket_name="test-bucket", cdn_base_url="https://cdn.example.com/")
+
+    assert storage.load_ocr_text("123e4567-e89b-12d3-a456-426614174000") == "씨디엔"
+    assert storage.load_ocr_text("123e4567-e89b-12d3-a456-426614174001") == "에스삼"
+    assert requests[0].full_url == (
+        "https://cdn.example.com/ocr/123e4567-e89b-12d3-a456-426614174000.txt"
+    )
+    assert requests[0].get_header("Accept-encoding") == "gzip"
+    mock_s3_client.get_object.assert_called_once()
+
+
+def test_load_sentences_reads_compressed_and_plain_objects(mock_s3_client):
+    """Test sentence data is decompressed when stored with gzip encoding."""
+    payload = '{"sentences": ["안녕하세요."]}'.encode()
+    mock_s3_client.get_object.side_effect = [
+        {"Body": io.BytesIO(gzip.compress(payload)), "ContentEncoding": "gzip"},
+        {"Body": io.BytesIO(payload)},
+    ]
+    storage = S3FileStorage(bucket_name="test-bucket")
+
+    compressed = storage.load_sentences("123e4567-e89b-12d3-a456-426614174000")
+    plain = storage.load_sentences("123e4567-e89b-12d3-a456-426614174001")
+
+    assert compressed == plain == {"sentences": ["안녕하세요."]}
 
 
 def test_load_ocr_text_not_found(mock_s3_client):
@@ -96,33 +215,127 @@ def test_load_ocr_text_not_found(mock_s3_client):
     assert "OCR text not found" in excinfo.value.detail
 
 
-def test_get_raw_file_path_finds_pdf(mock_s3_client):
-    """Test finding a PDF file in S3."""
+def test_load_ocr_text_serves_repeat_reads_from_memory(mock_s3_client):
+    """Test repeated loads only fetch the object once and saves refresh it."""
+    mock_s3_client.get_object.return_value = {"Body": io.BytesIO("첫 번째".encode())}
+    storage = S3FileStorage(bucket_name="test-bucket")
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+
+    assert storage.load_ocr_text(document_id) == "첫 번째"
+    assert storage.load_ocr_text(document_id) == "첫 번째"
+    storage.save_ocr_text(document_id, "두 번째")
+
+    assert storage.load_ocr_text(document_id) == "두 번째"
+    mock_s3_client.get_object.assert_called_once()
+
+
+def test_load_ocr_text_refetches_expired_objects(mock_s3_client, monkeypatch):
+    """Test cached bodies are dropped after the TTL so other workers' saves show up."""
+    mock_s3_client.get_object.side_effect = [
+        {"Body": io.BytesIO("첫 번째".encode())},
+        {"Body": io.BytesIO("두 번째".encode())},
+    ]
+    now = 1000.0
+    monkeypatch.setattr(s3.time, "monotonic", lambda: now)
     storage = S3FileStorage(bucket_name="test-bucket")
     document_id = "123e4567-e89b-12d3-a456-426614174000"
 
-    # Mock head_object to succeed for PDF
-    def head_object_side_effect(Bucket, Key):
-        if Key.endswith(".pdf"):
-            return {"ContentLength": 1000}
-        raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+    assert storage.load_ocr_text(document_id) == "첫 번째"
+    now += s3.OBJECT_CACHE_TTL
+    assert storage.load_ocr_text(document_id) == "두 번째"
+    assert mock_s3_client.get_object.call_count == 2
+
+
+def test_object_cache_is_bounded_by_total_bytes():
+    """Test least recently used bodies are evicted to stay within the byte budget."""
+    cache = s3._ObjectCache(max_bytes=10, ttl=60)
+
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    cache.get("a")
+    cache.put("c", b"90ab")
+    cache.put("huge", b"x" * 11)
 
-    mock_s3_client.head_object.side_effect = head_object_side_effect
+    assert cache.get("a") == b"1234"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"90ab"
+    assert cache.get("huge") is None
+
+
+def test_get_raw_file_path_finds_pdf(mock_s3_client):
+    """Test finding a PDF file in S3."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    mock_s3_client.list_objects_v2.return_value = {
+        "KeyCount": 1,
+        "Contents": [{"Key": f"raw/{document_id}.pdf"}],
+    }
 
     result = storage.get_raw_file_path(document_id)
 
     assert result == f"raw/{document_id}.pdf"
+    mock_s3_client.list_objects_v2.assert_called_once_with(
+        Bucket="test-bucket", Prefix=f"raw/{document_id}.", MaxKeys=1
+    )
+    mock_s3_client.head_object.assert_not_called()
+
+
+def test_get_raw_file_path_remembers_extension(mock_s3_client):
+    """Test known extensions are served without further S3 lookups."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    mock_s3_client.list_objects_v2.return_value = {"Contents": [{"Key": f"raw/{document_id}.png"}]}
+    upload = UploadFile(
+        file=io.BytesIO(b"%PDF-1.4"),
+        filename="scan.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+    uploaded_id = asyncio.run(storage.save_uploaded_file(upload))
+
+    assert storage.get_raw_file_path(uploaded_id) == f"raw/{uploaded_id}.pdf"
+    assert storage.get_raw_file_path(document_id) == f"raw/{document_id}.png"
+    assert storage.get_raw_file_path(document_id) == f"raw/{document_id}.png"
+    mock_s3_client.list_objects_v2.assert_called_once()
 
 
 def test_get_raw_file_path_not_found(mock_s3_client):
     """Test when raw file is not found."""
     storage = S3FileStorage(bucket_name="test-bucket")
     document_id = "123e4567-e89b-12d3-a456-426614174000"
-
-    # Mock head_object to always fail
-    error = ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
-    mock_s3_client.head_object.side_effect = error
+    mock_s3_client.list_objects_v2.return_value = {"KeyCount": 0}
 
     result = storage.get_raw_file_path(document_id)
 
     assert result is None
+
+
+def test_get_raw_file_content_downloads_into_memory(mock_s3_client):
+    """Test downloading raw file content through the transfer manager."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    mock_s3_client.list_objects_v2.return_value = {"Contents": [{"Key": f"raw/{document_id}.pdf"}]}
+
+    def download_fileobj_side_effect(Bucket, Key, Fileobj, Config=None):
+        Fileobj.write(b"content")
+
+    mock_s3_client.download_fileobj.side_effect = download_fileobj_side_effect
+
+    result = storage.get_raw_file_content(document_id)
+
+    assert result == b"content"
+    call_args = mock_s3_client.download_fileobj.call_args
+    assert call_args.args[:2] == ("test-bucket", f"raw/{document_id}.pdf")
+
+
+def test_has_ocr_text_uses_head_requests(mock_s3_client):
+    """Test OCR text existence is checked without downloading the object."""
+    storage = S3FileStorage(bucket_name="test-bucket")
+    error = ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+    mock_s3_client.head_object.side_effect = [{}, error]
+
+    assert storage.has_ocr_text("123e4567-e89b-12d3-a456-426614174000")
+    assert not storage.has_ocr_text("123e4567-e89b-12d3-a456-426614174001")
+    mock_s3_client.head_object.assert_called_with(
+        Bucket="test-bucket", Key="ocr/123e4567-e89b-12d3-a456-426614174001.txt"
+    )
+    mock_s3_client.get_object.assert_not_called()
@@ -1,6 +1,37 @@
 """Unit tests for text processing utilities."""
 
+import sys
+import types
+
+import pytest
+
 from services.processing import TextProcessor
+from services.processing import text as text_module
+
+
+@pytest.fixture
+def kss_calls(monkeypatch) -> list[str]:
+    """Replace KSS with a splitter that returns each text whole and records it."""
+    calls: list[str] = []
+    monkeypatch.setattr(
+        text_module, "split_sentences", lambda value: calls.append(value) or [value]
+    )
+    return calls
+
+
+@pytest.fixture
+def spacer_calls(monkeypatch) -> list[str]:
+    """Install a loaded Pecab stand-in that leaves text as is and records it."""
+    calls: list[str] = []
+
+    class FakeSpacer:
+        def spacing(self, value):
+            calls.append(value)
+            return value
+
+    monkeypatch.setattr(text_module, "_spacer", FakeSpacer())
+    monkeypatch.setattr(text_module, "_spacer_loaded", True)
+    return calls
 
 
 def test_split_into_sentences_removes_story_numbers_and_escapes():
@@ -28,3 +59,128 @@ def test_extract_vocabulary_honors_min_length():
     assert "옷" in short_vocab
     assert "옷" not in long_vocab
     assert "마음가짐" in long_vocab
+
+
+def test_split_into_sentences_reuses_kss_output(kss_calls):
+    processor = TextProcessor()
+
+    first = processor.split_into_sentences("첫 번째 문장입니다 두 번째 문장입니다")
+    second = processor.split_into_sentences("첫 번째 문장입니다 두 번째 문장입니다")
+    assert first == second
+    assert len(kss_calls) == 1
+
+    processor.clear_cache()
+    processor.split_into_sentences("첫 번째 문장입니다 두 번째 문장입니다")
+    assert len(kss_calls) == 2
+
+
+def test_split_into_sentences_does_not_cache_long_texts(monkeypatch, kss_calls):
+    monkeypatch.setattr(text_module, "MAX_CACHED_SENTENCE_TEXT", 20)
+    processor = TextProcessor()
+    short_text = "짧은 문장입니다"
+    long_text = "아주 긴 문장입니다 " * 5
+
+    for _ in range(2):
+        processor.split_into_sentences(short_text)
+        processor.split_into_sentences(long_text)
+
+    assert kss_calls.count(short_text) == 1
+    assert len(kss_calls) == 3
+    assert all(isinstance(key, bytes) for key in processor._sentence_cache)
+
+
+def test_spacer_is_loaded_once_and_shared(monkeypatch):
+    created = []
+
+    class FakePecab:
+        def __init__(self):
+            created.append(self)
+
+        def spacing(self, value):
+            return value
+
+    monkeypatch.setitem(sys.modules, "pecab", types.SimpleNamespace(Pecab=FakePecab))
+    monkeypatch.setattr(text_module, "_spacer", None)
+    monkeypatch.setattr(text_module, "_spacer_loaded", False)
+
+    TextProcessor().clean_text("외출하기전에거울앞에서서")
+    TextProcessor().clean_text("몇번이고입었다벗었다")
+
+    assert len(created) == 1
+
+
+def test_spacing_only_runs_on_unspaced_hangul(spacer_calls):
+    processor = TextProcessor()
+
+    processor.clean_text("외출하기 전에 거울 앞에 서서")
+    assert spacer_calls == []
+
+    processor.clean_text("외출하기전에거울앞에서서")
+    assert spacer_calls == ["외출하기전에거울앞에서서"]
+
+
+def test_split_many_matches_individual_splits():
+    processor = TextProcessor()
+    texts = [
+        "정해진 일은 아무지게 끝내고 반성은 나중에 한다. 외출하기 전에 거울 앞에 선다.",
+        "",
+        "몇 번이고 입었다 벗었다 반복하여 입을 옷을 정한다",
+    ]
+
+    batched = processor.split_many(texts)
+
+    assert batched == [processor.split_into_sentences(text) for text in texts]
+    assert batched[1] == []
+
+
+def test_extract_vocabulary_can_skip_sorting():
+    processor = TextProcessor()
+    text = "옷 하나 옷 둘 마음 마음가짐"
+
+    unsorted_vocab = processor.extract_vocabulary(text, sort=False)
+
+    assert sorted(unsorted_vocab) == processor.extract_vocabulary(text)
+
+
+def test_clean_text_reuses_last_result(monkeypatch):
+    calls = []
+    original_clean = TextProcessor._clean_text
+
+    def counting_clean(self, text):
+        calls.append(text)
+        return original_clean(self, text)
+
+    monkeypatch.setattr(TextProcessor, "_clean_text", counting_clean)
+    processor = TextProcessor()
+
+    text = "옷 하나  옷 둘\\n마음"
+    assert processor.clean_text(text) == "옷 하나 옷 둘 마음"
+    processor.extract_vocabulary(text)
+    assert calls == [text]
+
+    processor.clean_text("마음가짐")
+    assert calls == [text, "마음가짐"]
+
+
+def test_warmup_loads_spacer_and_kss_without_caching(kss_calls, spacer_calls):
+    processor = TextProcessor()
+
+    processor.warmup()
+
+    assert len(spacer_calls) == 1
+    assert len(kss_calls) == 1
+    assert not processor._sentence_cache
+
+
+def test_process_many_matches_sequential_results():
+    processor = TextProcessor()
+    texts = ["옷 하나  옷 둘", "마음\\n마음가짐", ""]
+
+    results = processor.process_many(texts, method="extract_vocabulary", workers=2)
+
+    assert results == [processor.extract_vocabulary(text) for text in texts]
+
+
+def test_process_many_rejects_unknown_methods():
+    with pytest.raises(ValueError):
+        TextProcessor().process_many(["옷"], method="clear_cache")